@@ -0,0 +1,179 @@
+"""In-process fake Anthem hub for exercising the API client without hardware.
+
+The fake serves the same ``/web/api/v1/device/*`` endpoints as a real hub:
+
+* ``request_user_login`` decrypts the RSA-encrypted PIN hash and issues a
+  JWT whose ``exp`` is ``token_lifetime`` seconds away.
+* ``get_hub_running_state`` answers without a token, and rejects bad or
+  expired tokens with either a 403 or an ``"Unauthorised token"`` body.
+* ``req_update_command`` handles ``water_test_start``/``water_test_stop``.
+
+A real hub encrypts against Kohler's key pair, so the fake generates its
+own; use :meth:`FakeHub.attach` to point a client at it. Latency and
+timeouts can be injected per hub.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections import Counter
+from dataclasses import dataclass, field
+import hashlib
+import json
+import random
+import time
+import uuid
+
+from aiohttp import web
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+
+API_PREFIX = "/web/api/v1/device"
+
+
+def _b64url(data: dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+
+@dataclass
+class FakeHubConfig:
+    """Behaviour knobs for a fake hub."""
+
+    pin: str = "1234"
+    token_lifetime: float = 600
+    latency: float = 0.0  # seconds added to every response
+    latency_jitter: float = 0.0  # +/- seconds of uniform jitter
+    timeout_rate: float = 0.0  # fraction of requests that never answer in time
+    hang_time: float = 30.0  # how long a "timed out" request stalls
+    reject_with_403: bool = False  # otherwise "Unauthorised token" in the body
+
+
+@dataclass
+class FakeHub:
+    """A single simulated hub served on a local port."""
+
+    config: FakeHubConfig = field(default_factory=FakeHubConfig)
+    running: bool = False
+    device_names: list[str] = field(default_factory=list)
+    zones: dict[str, dict] = field(default_factory=dict)
+    requests: Counter[str] = field(default_factory=Counter)
+    logins: int = 0
+
+    def __post_init__(self) -> None:
+        self._private_key = rsa.generate_private_key(public_exponent=65537, key_size=1024)
+        self.public_key_pem = self._private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.PKCS1
+        ).decode()
+        self._tokens: dict[str, float] = {}
+        self._runner: web.AppRunner | None = None
+        self.host = ""
+
+    def attach(self, client) -> None:
+        """Make an AnthemApiClient encrypt its PIN for this hub's key.
+
+        Clients normally share Anthem's key, so this overrides it for the
+        one client and drops any login payload it already encrypted.
+        """
+        client._public_key = serialization.load_pem_public_key(self.public_key_pem.encode())
+        client._encrypted_pin = None
+
+    async def start(self) -> str:
+        """Serve the hub on an ephemeral port and return its host:port."""
+        app = web.Application()
+        app.router.add_post(f"{API_PREFIX}/request_user_login", self._login)
+        app.router.add_get(f"{API_PREFIX}/get_hub_running_state", self._running_state)
+        app.router.add_post(f"{API_PREFIX}/req_update_command", self._command)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.host = f"127.0.0.1:{port}"
+        return self.host
+
+    async def stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _delay(self) -> None:
+        cfg = self.config
+        if cfg.timeout_rate and random.random() < cfg.timeout_rate:
+            await asyncio.sleep(cfg.hang_time)
+        delay = cfg.latency + random.uniform(-cfg.latency_jitter, cfg.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _issue_token(self) -> str:
+        exp = time.time() + self.config.token_lifetime
+        token = ".".join(
+            (
+                _b64url({"alg": "RS256", "typ": "JWT"}),
+                _b64url({"exp": int(exp), "jti": uuid.uuid4().hex}),
+                "signature",
+            )
+        )
+        self._tokens[token] = exp
+        return token
+
+    def _token_error(self, request: web.Request) -> web.Response | None:
+        auth = request.headers.get("Authorization", "")
+        token = auth.removeprefix("Bearer ")
+        exp = self._tokens.get(token)
+        if exp is not None and exp > time.time():
+            return None
+        if self.config.reject_with_403:
+            return web.Response(status=403, text="Forbidden")
+        return web.json_response({"status": "false", "error": "Unauthorised token"})
+
+    async def _login(self, request: web.Request) -> web.Response:
+        self.requests["request_user_login"] += 1
+        await self._delay()
+        body = await request.json()
+        try:
+            pin_hash = self._private_key.decrypt(
+                base64.b64decode(body["pin"]), padding.PKCS1v15()
+            ).decode()
+        except (KeyError, ValueError):
+            return web.json_response({"status": "false", "error": "Invalid request"})
+        if pin_hash != hashlib.sha256(self.config.pin.encode()).hexdigest():
+            return web.json_response({"status": "false", "error": "Invalid PIN"})
+        self.logins += 1
+        return web.json_response({"status": "true", "token": self._issue_token()})
+
+    async def _running_state(self, request: web.Request) -> web.Response:
+        self.requests["get_hub_running_state"] += 1
+        await self._delay()
+        if "random_uuid" not in request.headers:
+            return web.json_response({"status": "false", "error": "Missing random_uuid"})
+        if "Authorization" in request.headers and (error := self._token_error(request)):
+            return error
+        return web.json_response(
+            {
+                "status": "true",
+                "running": self.running,
+                "devicename": self.device_names,
+                **self.zones,
+            }
+        )
+
+    async def _command(self, request: web.Request) -> web.Response:
+        self.requests["req_update_command"] += 1
+        await self._delay()
+        if error := self._token_error(request):
+            return error
+        body = await request.json()
+        command = body.get("req_command")
+        if command == "water_test_start":
+            self.running = True
+            self.device_names = ["Shower"]
+            self.zones = {key: value for key, value in body.items() if key.startswith("zone")}
+        elif command == "water_test_stop":
+            self.running = False
+            self.device_names = []
+            self.zones = {}
+        else:
+            return web.json_response({"status": "false", "error": f"Unknown command {command}"})
+        return web.json_response({"status": "true", "req_command": command})
@@ -0,0 +1,216 @@
+"""Replay captured hub traffic through the API client.
+
+Captures come from the integration's "Capture hub traffic" option, see
+``custom_components/anthem_shower/capture.py``. :class:`ReplaySession`
+stands in for the client's aiohttp session and answers each request with
+the next recorded reply for its endpoint, after the recorded round trip
+divided by ``speed``. Recorded timeouts, connection failures and
+rejected tokens are replayed as such, so login storms and slow polls can
+be reproduced offline::
+
+    python -m bench.run_benchmarks replay --capture capture.jsonl --speed 10
+
+:func:`replay_capture` issues the recorded calls at their recorded
+offsets, also divided by ``speed``; a ReplaySession can equally be given
+to a client driven by the coordinator. Token lifetimes are not scaled,
+so an accelerated replay renews tokens less often than the hub did.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+import json
+import time
+from typing import Any
+
+import aiohttp
+
+from custom_components.anthem_shower.api import AnthemApiClient
+from custom_components.anthem_shower.capture import REDACTED
+
+LOGIN_ENDPOINT = "request_user_login"
+POLL_ENDPOINT = "get_hub_running_state"
+
+
+@dataclass
+class Capture:
+    """A capture file: where it was taken and its exchanges in order."""
+
+    host: str
+    started: float
+    exchanges: list[dict[str, Any]]
+
+    @classmethod
+    def load(cls, path: str) -> Capture:
+        """Read a capture written by TrafficCapture."""
+        with open(path, encoding="utf-8") as file:
+            header, *exchanges = (json.loads(line) for line in file if line.strip())
+        return cls(header["host"], header["started"], exchanges)
+
+    @property
+    def authenticated(self) -> bool:
+        """Return whether the client had a PIN."""
+        return any(exchange.get("auth") for exchange in self.exchanges)
+
+    @property
+    def read_retries(self) -> int:
+        """Return the longest run of retried polls, i.e. the client's setting."""
+        longest = run = 0
+        for exchange in self.exchanges:
+            if exchange["endpoint"] != POLL_ENDPOINT:
+                continue
+            run = run + 1 if exchange.get("retry") else 0
+            longest = max(longest, run)
+        return longest
+
+
+def _token(ttl: float | None) -> str:
+    """Return an unsigned JWT expiring ``ttl`` seconds from now."""
+    if ttl is None:
+        return REDACTED
+    claims = base64.urlsafe_b64encode(json.dumps({"exp": time.time() + ttl}).encode())
+    return f"replay.{claims.decode().rstrip('=')}.replay"
+
+
+class _ReplayResponse:
+    def __init__(self, status: int, reply: Any, invalid: bool) -> None:
+        self.status = status
+        self._reply = reply
+        self._invalid = invalid
+
+    async def json(self, content_type: str | None = None) -> Any:
+        if self._invalid:
+            raise ValueError("Recorded reply was not JSON")
+        return self._reply
+
+
+class _ReplayRequest:
+    def __init__(self, session: ReplaySession, endpoint: str, timeout: Any) -> None:
+        self._session = session
+        self._endpoint = endpoint
+        self._timeout = timeout
+
+    async def __aenter__(self) -> _ReplayResponse:
+        return await self._session._reply(self._endpoint, self._timeout)
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+
+@dataclass
+class ReplaySession:
+    """Answer AnthemApiClient requests from a capture instead of a hub.
+
+    Replies are handed out per endpoint in recorded order, whatever
+    order the client asks in. A recorded round trip longer than the
+    request's total timeout times out after that timeout instead.
+    """
+
+    capture: Capture
+    speed: float = 1.0
+    requests: Counter[str] = field(default_factory=Counter)
+
+    def __post_init__(self) -> None:
+        self._replies: defaultdict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        for exchange in self.capture.exchanges:
+            self._replies[exchange["endpoint"]].append(exchange)
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        json: dict | None = None,
+        headers: dict[str, str] | None = None,
+        timeout: aiohttp.ClientTimeout | None = None,
+    ) -> _ReplayRequest:
+        """Return the recorded reply to a request, as aiohttp would."""
+        return _ReplayRequest(self, url.rsplit("/", 1)[-1], timeout)
+
+    async def close(self) -> None:
+        """Do nothing; there is no connection to close."""
+
+    async def _reply(self, endpoint: str, timeout: aiohttp.ClientTimeout | None) -> _ReplayResponse:
+        self.requests[endpoint] += 1
+        if not (replies := self._replies[endpoint]):
+            raise aiohttp.ClientConnectionError(f"Capture has no more {endpoint} replies")
+        exchange = replies.popleft()
+        delay = exchange["elapsed"] / self.speed
+        if timeout is not None and timeout.total is not None and delay > timeout.total:
+            await asyncio.sleep(timeout.total)
+            raise TimeoutError
+        await asyncio.sleep(delay)
+
+        error = exchange.get("error")
+        if error == "timeout":
+            raise TimeoutError
+        if error == "connection":
+            raise aiohttp.ClientConnectionError("Recorded connection failure")
+        reply = exchange.get("reply")
+        if isinstance(reply, dict) and reply.get("token") == REDACTED:
+            reply = {key: value for key, value in reply.items() if key != "token_ttl"}
+            reply["token"] = _token(exchange["reply"].get("token_ttl"))
+        return _ReplayResponse(exchange.get("status") or 200, reply, error == "invalid_reply")
+
+
+@dataclass
+class ReplayResult:
+    """Latencies and outcomes of the calls issued during a replay."""
+
+    latencies: defaultdict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: Counter[str] = field(default_factory=Counter)
+    logins: int = 0
+    wall: float = 0.0
+
+
+async def replay_capture(capture: Capture, *, speed: float = 1.0) -> ReplayResult:
+    """Issue a capture's calls through a client at recorded or accelerated speed.
+
+    Logins and retries are left to the client, which takes their replies
+    from the capture when it decides to make them.
+    """
+    session = ReplaySession(capture, speed)
+    client = AnthemApiClient(
+        capture.host,
+        "0000" if capture.authenticated else None,
+        session,
+        read_retries=capture.read_retries,
+    )
+    result = ReplayResult()
+
+    async def call(exchange: dict[str, Any]) -> None:
+        endpoint = exchange["endpoint"]
+        start = time.perf_counter()
+        try:
+            await client._request(
+                exchange["method"],
+                endpoint,
+                exchange.get("request"),
+                authenticated=bool(exchange.get("auth")),
+                retries=client.read_retries if endpoint == POLL_ENDPOINT else 0,
+            )
+        except Exception as err:
+            result.errors[f"{endpoint}:{type(err).__name__}"] += 1
+        result.latencies[endpoint].append(time.perf_counter() - start)
+
+    calls = [
+        exchange
+        for exchange in capture.exchanges
+        if exchange["endpoint"] != LOGIN_ENDPOINT and not exchange.get("retry")
+    ]
+    loop = asyncio.get_running_loop()
+    began = loop.time()
+    tasks = []
+    try:
+        for exchange in calls:
+            await asyncio.sleep(max(0, began + exchange["t"] / speed - loop.time()))
+            tasks.append(asyncio.create_task(call(exchange)))
+        await asyncio.gather(*tasks)
+    finally:
+        await client.async_close()
+    result.logins = session.requests[LOGIN_ENDPOINT]
+    result.wall = loop.time() - began
+    return result
@@ -0,0 +1,178 @@
+"""Offline performance benchmarks against the fake hub.
+
+Importing the client runs the integration's ``__init__``, so this needs
+Python 3.12+ with Home Assistant installed (``pip install -r
+requirements_test.txt`` is enough). Run from the repository root::
+
+    python -m bench.run_benchmarks
+    python -m bench.run_benchmarks --hubs 500 --latency 0.02
+    python -m bench.run_benchmarks replay --capture capture.jsonl --speed 10
+
+Each benchmark prints one line of results so runs can be diffed to spot
+regressions in AnthemApiClient and the request queue.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import time
+
+from custom_components.anthem_shower.api import AnthemApiClient
+from custom_components.anthem_shower.const import DEFAULT_FLOW_RATE, DEFAULT_OUTLET_STATE
+from custom_components.anthem_shower.models import ZoneState
+from custom_components.anthem_shower.request_queue import AnthemRequestQueue
+from custom_components.anthem_shower.scheduler import AnthemPollScheduler
+
+from .fake_hub import FakeHub, FakeHubConfig
+from .replay import Capture, replay_capture
+
+
+START_ZONES = (ZoneState(1, 100, DEFAULT_FLOW_RATE, DEFAULT_OUTLET_STATE),)
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _report(name: str, samples: list[float], **extra: float | int) -> None:
+    fields = " ".join(f"{key}={value:.1f}" if isinstance(value, float) else f"{key}={value}"
+                      for key, value in extra.items())
+    print(
+        f"{name:<16} n={len(samples):<5} "
+        f"p50={_percentile(samples, 50) * 1000:.1f}ms "
+        f"p95={_percentile(samples, 95) * 1000:.1f}ms "
+        f"max={max(samples, default=0) * 1000:.1f}ms {fields}"
+    )
+
+
+async def _timed(func: Callable[[], Awaitable[object]]) -> float:
+    start = time.perf_counter()
+    await func()
+    return time.perf_counter() - start
+
+
+async def _start_hub(config: FakeHubConfig, pin: str | None) -> tuple[FakeHub, AnthemApiClient]:
+    hub = FakeHub(config)
+    host = await hub.start()
+    client = AnthemApiClient(host, pin)
+    hub.attach(client)
+    return hub, client
+
+
+async def bench_poll_latency(args: argparse.Namespace) -> None:
+    """Sequential authenticated polls against one hub."""
+    hub, client = await _start_hub(FakeHubConfig(latency=args.latency), "1234")
+    try:
+        samples = [await _timed(client.get_running_state) for _ in range(args.polls)]
+    finally:
+        await client.async_close()
+        await hub.stop()
+    _report("poll_latency", samples, logins=hub.logins)
+
+
+async def bench_login_rate(args: argparse.Namespace) -> None:
+    """Logins per hour while polling across several short-lived tokens."""
+    config = FakeHubConfig(latency=args.latency, token_lifetime=args.token_lifetime)
+    hub, client = await _start_hub(config, "1234")
+    samples: list[float] = []
+    start = time.monotonic()
+    try:
+        while (elapsed := time.monotonic() - start) < args.duration:
+            samples.append(await _timed(client.get_running_state))
+            await asyncio.sleep(args.poll_interval)
+    finally:
+        await client.async_close()
+        await hub.stop()
+    _report("login_rate", samples, logins=hub.logins, logins_per_hour=hub.logins * 3600 / elapsed)
+
+
+async def bench_command_rtt(args: argparse.Namespace) -> None:
+    """Start/stop round trips through the request queue."""
+    hub, client = await _start_hub(FakeHubConfig(latency=args.latency), "1234")
+    queue = AnthemRequestQueue(client)
+    samples: list[float] = []
+    try:
+        for _ in range(args.commands):
+            samples.append(await _timed(lambda: queue.async_start_zones(START_ZONES)))
+            samples.append(await _timed(queue.async_stop_water_test))
+    finally:
+        await queue.async_close()
+        await client.async_close()
+        await hub.stop()
+    _report("command_rtt", samples, logins=hub.logins)
+
+
+async def bench_fleet(args: argparse.Namespace) -> None:
+    """One round of polls across many hubs sharing the domain scheduler."""
+    config = FakeHubConfig(latency=args.latency, latency_jitter=args.latency / 2)
+    started = await asyncio.gather(*(_start_hub(config, None) for _ in range(args.hubs)))
+    scheduler = AnthemPollScheduler()
+    queues = [AnthemRequestQueue(client, scheduler.poll_slot) for _, client in started]
+    try:
+        wall = time.perf_counter()
+        samples = await asyncio.gather(*(_timed(queue.async_poll) for queue in queues))
+        wall = time.perf_counter() - wall
+    finally:
+        for queue in queues:
+            await queue.async_close()
+        for hub, client in started:
+            await client.async_close()
+            await hub.stop()
+    _report("fleet_poll", list(samples), hubs=args.hubs, wall_s=wall,
+            polls_per_min=scheduler.throughput)
+
+
+async def bench_replay(args: argparse.Namespace) -> None:
+    """A captured session replayed through the client, per endpoint."""
+    if not args.capture:
+        print("replay           skipped, needs --capture")
+        return
+    result = await replay_capture(Capture.load(args.capture), speed=args.speed)
+    for endpoint, samples in result.latencies.items():
+        errors = sum(
+            count for key, count in result.errors.items() if key.startswith(f"{endpoint}:")
+        )
+        _report(f"replay_{endpoint.split('_')[-1]}", samples, errors=errors)
+    print(f"replay           logins={result.logins} wall_s={result.wall:.1f} speed={args.speed}")
+
+
+BENCHMARKS = {
+    "poll_latency": bench_poll_latency,
+    "login_rate": bench_login_rate,
+    "command_rtt": bench_command_rtt,
+    "fleet": bench_fleet,
+    "replay": bench_replay,
+}
+
+
+def main() -> None:
+    """Parse arguments and run the selected benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("benchmarks", nargs="*", help=f"any of {', '.join(BENCHMARKS)}")
+    parser.add_argument("--latency", type=float, default=0.005, help="hub latency (s)")
+    parser.add_argument("--polls", type=int, default=200)
+    parser.add_argument("--commands", type=int, default=50)
+    parser.add_argument("--hubs", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=10.0, help="login_rate run time (s)")
+    parser.add_argument("--poll-interval", type=float, default=0.1)
+    parser.add_argument("--token-lifetime", type=float, default=65.0)
+    parser.add_argument("--capture", help="traffic capture (JSONL) to replay")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed-up")
+    args = parser.parse_args()
+    if unknown := set(args.benchmarks) - set(BENCHMARKS):
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    async def run() -> None:
+        for name in args.benchmarks or BENCHMARKS:
+            await BENCHMARKS[name](args)
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -2,45 +2,196 @@
 
 from __future__ import annotations
 
+from dataclasses import replace
 import logging
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 
 from .api import AnthemApiClient
-from .const import CONF_HOST, CONF_PIN, CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    CAPTURE_FILENAME,
+    COMMAND_TIMEOUT_MAX,
+    CONF_CAPTURE_TRAFFIC,
+    CONF_COMMAND_TIMEOUT,
+    CONF_HOST,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_PIN,
+    CONF_POLL_TIMEOUT,
+    CONF_READ_RETRIES,
+    CONF_SCAN_INTERVAL,
+    CONF_STALE_TTL,
+    DATA_PENDING_TOKENS,
+    DATA_SCHEDULER,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_READ_RETRIES,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_TTL,
+    DOMAIN,
+    POLL_TIMEOUT_MAX,
+    STORAGE_VERSION,
+)
 from .coordinator import AnthemCoordinator
+from .scheduler import AnthemPollScheduler
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
-PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.NUMBER, Platform.VALVE]
+PLATFORMS: list[Platform] = [
+    Platform.BINARY_SENSOR,
+    Platform.NUMBER,
+    Platform.SENSOR,
+    Platform.VALVE,
+]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 type AnthemConfigEntry = ConfigEntry
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Anthem Shower domain services."""
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: AnthemConfigEntry) -> bool:
     """Set up Anthem Shower from a config entry."""
-    session = async_get_clientsession(hass)
+    settings = _entry_settings(entry)
     client = AnthemApiClient(
         host=entry.data[CONF_HOST],
         pin=entry.data.get(CONF_PIN),
-        session=session,
     )
-    scan_interval = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-    coordinator = AnthemCoordinator(hass, client, scan_interval)
+    _apply_client_settings(client, settings)
+    await _async_set_capture(hass, entry, client, settings[CONF_CAPTURE_TRAFFIC])
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_SCHEDULER not in domain_data:
+        domain_data[DATA_SCHEDULER] = AnthemPollScheduler()
+    scheduler: AnthemPollScheduler = domain_data[DATA_SCHEDULER]
+
+    coordinator = AnthemCoordinator(
+        hass,
+        client,
+        settings[CONF_SCAN_INTERVAL],
+        min_interval=settings[CONF_MIN_SCAN_INTERVAL],
+        max_interval=settings[CONF_MAX_SCAN_INTERVAL],
+        stale_ttl=settings[CONF_STALE_TTL],
+        entry_id=entry.entry_id,
+        scheduler=scheduler,
+    )
+    first_poll_delay = scheduler.register(entry.entry_id)
 
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        restored = await coordinator.async_restore()
 
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+        # Adopt the token the config flow obtained instead of logging in again
+        if pending := domain_data.get(DATA_PENDING_TOKENS, {}).pop(entry.data[CONF_HOST], None):
+            client.restore_token(*pending)
+
+        # Hubs come up from the cached snapshot when there is one and confirm
+        # it with the first scheduled poll, staggered so they don't all poll
+        # at once
+        if not restored:
+            await coordinator.async_config_entry_first_refresh()
+    except Exception:
+        # Stop the request queue's worker as well as the client
+        await coordinator.async_shutdown()
+        await client.async_close()
+        scheduler.unregister(entry.entry_id)
+        raise
+    coordinator.async_set_start_phase(first_poll_delay)
+
+    domain_data[entry.entry_id] = coordinator
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     return True
 
 
+def _entry_settings(entry: AnthemConfigEntry) -> dict[str, Any]:
+    """Return polling and request settings, options taking precedence."""
+    return {
+        CONF_SCAN_INTERVAL: DEFAULT_SCAN_INTERVAL,
+        CONF_MIN_SCAN_INTERVAL: DEFAULT_MIN_SCAN_INTERVAL,
+        CONF_MAX_SCAN_INTERVAL: DEFAULT_MAX_SCAN_INTERVAL,
+        CONF_STALE_TTL: DEFAULT_STALE_TTL,
+        CONF_POLL_TIMEOUT: POLL_TIMEOUT_MAX,
+        CONF_COMMAND_TIMEOUT: COMMAND_TIMEOUT_MAX,
+        CONF_READ_RETRIES: DEFAULT_READ_RETRIES,
+        CONF_CAPTURE_TRAFFIC: False,
+        **entry.data,
+        **entry.options,
+    }
+
+
+def _apply_client_settings(client: AnthemApiClient, settings: dict[str, Any]) -> None:
+    client.read_retries = settings[CONF_READ_RETRIES]
+    client.poll_budget = replace(client.poll_budget, maximum=settings[CONF_POLL_TIMEOUT])
+    client.command_budget = replace(client.command_budget, maximum=settings[CONF_COMMAND_TIMEOUT])
+
+
+async def _async_update_listener(hass: HomeAssistant, entry: AnthemConfigEntry) -> None:
+    """Apply changed options or hub address without reloading the entry.
+
+    The client keeps its token and session and the coordinator its cached
+    state, so no login or blocking first refresh is needed.
+    """
+    coordinator: AnthemCoordinator = hass.data[DOMAIN][entry.entry_id]
+    settings = _entry_settings(entry)
+    _async_apply_settings(coordinator, settings)
+    await _async_set_capture(hass, entry, coordinator.client, settings[CONF_CAPTURE_TRAFFIC])
+    host = entry.data[CONF_HOST]
+    if host == coordinator.client.host:
+        return
+    _LOGGER.info("Anthem hub %s moved from %s to %s", entry.title, coordinator.client.host, host)
+    coordinator.client.set_host(host)
+    device_registry = dr.async_get(hass)
+    if device := device_registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)}):
+        device_registry.async_update_device(device.id, configuration_url=f"http://{host}")
+    await coordinator.async_request_refresh()
+
+
+@callback
+def _async_apply_settings(coordinator: AnthemCoordinator, settings: dict[str, Any]) -> None:
+    _apply_client_settings(coordinator.client, settings)
+    coordinator.async_apply_settings(
+        settings[CONF_SCAN_INTERVAL],
+        settings[CONF_MIN_SCAN_INTERVAL],
+        settings[CONF_MAX_SCAN_INTERVAL],
+        settings[CONF_STALE_TTL],
+    )
+
+
+async def _async_set_capture(
+    hass: HomeAssistant, entry: AnthemConfigEntry, client: AnthemApiClient, enabled: bool
+) -> None:
+    """Start or stop capturing the hub's traffic to the config directory."""
+    if enabled and client.capture is None:
+        path = hass.config.path(CAPTURE_FILENAME.format(entry_id=entry.entry_id))
+        _LOGGER.info("Capturing Anthem hub traffic to %s", path)
+        client.start_capture(path)
+    elif not enabled and client.capture is not None:
+        await client.async_stop_capture()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: AnthemConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: AnthemCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+        await coordinator.client.async_close()
+        coordinator.scheduler.unregister(entry.entry_id)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: AnthemConfigEntry) -> None:
+    """Remove the cached token, state and session history of a deleted entry."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.history").async_remove()
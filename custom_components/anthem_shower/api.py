@@ -2,44 +2,159 @@
 
 from __future__ import annotations
 
+import asyncio
 import base64
+from collections.abc import Iterable
+from contextlib import nullcontext
+from functools import cache
 import hashlib
 import json
 import logging
 import time
+from typing import TYPE_CHECKING
 import uuid
 
 import aiohttp
 
-from cryptography.hazmat.primitives.asymmetric import padding as asym_padding
-from cryptography.hazmat.primitives.serialization import load_pem_public_key
-
+from .capture import CapturedExchange, TrafficCapture
+from .circuit_breaker import CircuitBreaker
 from .const import ANTHEM_RSA_PUBLIC_KEY_PEM
+from .metrics import ClientMetrics
+from .models import HubState, ZoneState
+from .timeouts import COMMAND_TIMEOUT_BUDGET, POLL_TIMEOUT_BUDGET, TimeoutBudget
+
+if TYPE_CHECKING:
+    from cryptography.hazmat.primitives.asymmetric.rsa import RSAPublicKey
 
 _LOGGER = logging.getLogger(__name__)
 
 TOKEN_EXPIRY_BUFFER = 60  # seconds
+TOKEN_RENEW_MARGIN = 30  # renew this long before the expiry buffer is reached
+TOKEN_MIN_RENEW_DELAY = 10  # seconds; shorter-lived tokens are renewed on demand
+
+# Connection tuning for the hub's small embedded HTTP server; requests
+# normally get a tighter latency-derived timeout from a TimeoutBudget
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
+HUB_CONNECTION_LIMIT = 2
+HUB_KEEPALIVE_TIMEOUT = 30  # seconds
+DNS_CACHE_TTL = 300  # seconds
+
+
+@cache
+def _anthem_public_key() -> RSAPublicKey:
+    """Load Anthem's public key, shared by every client.
+
+    cryptography is only imported here, so setups without a PIN never
+    pay for it.
+    """
+    from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
+    return load_pem_public_key(ANTHEM_RSA_PUBLIC_KEY_PEM.encode())
 
 
 class AnthemAuthError(Exception):
     """Authentication failed."""
 
 
+class TokenRejected(AnthemAuthError):
+    """The hub refused a token the request carried."""
+
+
 class AnthemConnectionError(Exception):
     """Connection to hub failed."""
 
 
+def _json_number(value: float | None) -> float | int | None:
+    if value is None or not float(value).is_integer():
+        return value
+    return int(value)
+
+
+def build_start_payload(zones: Iterable[ZoneState]) -> dict:
+    """Build one water_test_start payload setting every given zone."""
+    payload: dict = {"req_command": "water_test_start"}
+    for zone in zones:
+        payload[f"zone{zone.number}"] = {
+            "temperature": zone.temperature,
+            "flowRate": _json_number(zone.flow_rate),
+            "outletState": list(zone.outlets),
+        }
+    return payload
+
+
+def _parse_state(data: dict) -> HubState:
+    """Parse a hub reply, treating one that can't be parsed as a bad reply."""
+    try:
+        return HubState.from_response(data)
+    except (TypeError, ValueError, OverflowError) as err:
+        raise AnthemConnectionError(f"Unexpected state from hub: {err}") from err
+
+
 class AnthemApiClient:
     """Client for the Anthem shower local API."""
 
-    def __init__(self, host: str, pin: str | None, session: aiohttp.ClientSession) -> None:
-        """Initialise the client."""
+    def __init__(
+        self,
+        host: str,
+        pin: str | None,
+        session: aiohttp.ClientSession | None = None,
+        read_retries: int = 0,
+        poll_budget: TimeoutBudget = POLL_TIMEOUT_BUDGET,
+        command_budget: TimeoutBudget = COMMAND_TIMEOUT_BUDGET,
+    ) -> None:
+        """Initialise the client.
+
+        Without a session the client owns a dedicated keep-alive connection
+        pool for the hub, which is closed by async_close(). read_retries
+        sets how many times a failed state poll is retried. State polls
+        take their timeouts from poll_budget, logins and commands from
+        command_budget.
+        """
+        self.read_retries = read_retries
+        self.poll_budget = poll_budget
+        self.command_budget = command_budget
         self._host = host
         self._pin = pin
-        self._session = session
+        self._owns_session = session is None
+        self._session = session or self._create_session()
         self._token: str | None = None
         self._token_exp: float = 0
-        self._public_key = load_pem_public_key(ANTHEM_RSA_PUBLIC_KEY_PEM.encode()) if pin else None
+        self._auth_task: asyncio.Task[str] | None = None
+        self._renew_handle: asyncio.TimerHandle | None = None
+        self.metrics = ClientMetrics()
+        self.breaker = CircuitBreaker(host)
+        # Set to record every request and reply, see start_capture()
+        self.capture: TrafficCapture | None = None
+        # Replaces Anthem's key, e.g. for a test hub; see bench.fake_hub
+        self._public_key: RSAPublicKey | None = None
+        self._encrypted_pin: str | None = None
+
+    @staticmethod
+    def _create_session() -> aiohttp.ClientSession:
+        """Create a keep-alive session sized for the hub."""
+        connector = aiohttp.TCPConnector(
+            limit=HUB_CONNECTION_LIMIT,
+            limit_per_host=HUB_CONNECTION_LIMIT,
+            keepalive_timeout=HUB_KEEPALIVE_TIMEOUT,
+            use_dns_cache=True,
+            ttl_dns_cache=DNS_CACHE_TTL,
+        )
+        return aiohttp.ClientSession(connector=connector, timeout=REQUEST_TIMEOUT)
+
+    @property
+    def host(self) -> str:
+        """Return the hub's address."""
+        return self._host
+
+    def set_host(self, host: str) -> None:
+        """Point the client at a new hub address.
+
+        The token and session are kept, and the circuit breaker is closed
+        so the new address is tried straight away.
+        """
+        self._host = host
+        self.breaker.name = host
+        self.breaker.reset()
 
     @property
     def _base_url(self) -> str:
@@ -55,33 +170,46 @@ class AnthemApiClient:
         return headers
 
     def _encrypt_pin(self) -> str:
-        """SHA-256 hash the PIN then RSA-encrypt it, returning base64."""
-        if not self._pin or not self._public_key:
+        """SHA-256 hash the PIN then RSA-encrypt it, returning base64.
+
+        This blocks on the first call, which imports cryptography and loads
+        the key, so it is run in the executor.
+        """
+        from cryptography.hazmat.primitives.asymmetric import padding as asym_padding
+
+        if not self._pin:
             raise AnthemAuthError("PIN not configured")
+        public_key = self._public_key or _anthem_public_key()
         pin_hash = hashlib.sha256(self._pin.encode()).hexdigest()
-        encrypted = self._public_key.encrypt(
+        encrypted = public_key.encrypt(
             pin_hash.encode(),
             asym_padding.PKCS1v15(),
         )
         return base64.b64encode(encrypted).decode()
 
     async def _authenticate(self) -> str:
-        """Login and return a JWT token."""
-        url = f"{self._base_url}/request_user_login"
+        """Login and return a JWT token.
+
+        The encrypted PIN is reused for every login until the hub rejects
+        it, so a login costs only the round trip.
+        """
+        if self._encrypted_pin is None:
+            self._encrypted_pin = await asyncio.get_running_loop().run_in_executor(
+                None, self._encrypt_pin
+            )
         payload = {
             "req_command": "login",
-            "pin": self._encrypt_pin(),
+            "pin": self._encrypted_pin,
         }
         try:
-            async with self._session.post(
-                url, json=payload, headers=self._common_headers(), timeout=aiohttp.ClientTimeout(total=10)
-            ) as resp:
-                data = await resp.json(content_type=None)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise AnthemConnectionError(f"Cannot connect to Anthem hub at {self._host}") from err
-
-        token = data.get("token") if isinstance(data, dict) else None
+            data = await self._send("POST", "request_user_login", payload, authenticated=False)
+        except AnthemAuthError:
+            self._encrypted_pin = None
+            raise
+
+        token = data.get("token")
         if not token:
+            self._encrypted_pin = None
             raise AnthemAuthError(f"Login failed: {data}")
 
         # Parse JWT expiry
@@ -95,144 +223,252 @@ class AnthemApiClient:
             self._token_exp = time.time() + 600
 
         self._token = token
+        self.metrics.record_login()
         _LOGGER.debug("Anthem token refreshed, expires %s", self._token_exp)
+        self._schedule_renewal()
         return token
 
+    def _start_authentication(self) -> asyncio.Task[str]:
+        """Return the in-flight login, starting one if none is running."""
+        if self._auth_task is None:
+            self._auth_task = asyncio.create_task(self._authenticate())
+            self._auth_task.add_done_callback(self._authentication_done)
+        return self._auth_task
+
+    def _authentication_done(self, task: asyncio.Task[str]) -> None:
+        self._auth_task = None
+        if not task.cancelled() and (err := task.exception()) is not None:
+            _LOGGER.debug("Anthem login to %s failed: %s", self._host, err)
+
+    def _schedule_renewal(self) -> None:
+        """Renew the token in the background before callers see it expire."""
+        self._cancel_renewal()
+        delay = self._token_exp - time.time() - TOKEN_EXPIRY_BUFFER - TOKEN_RENEW_MARGIN
+        if delay < TOKEN_MIN_RENEW_DELAY:
+            return
+        self._renew_handle = asyncio.get_running_loop().call_later(delay, self._renew_token)
+
+    def _cancel_renewal(self) -> None:
+        if self._renew_handle is not None:
+            self._renew_handle.cancel()
+            self._renew_handle = None
+
+    def _renew_token(self) -> None:
+        self._renew_handle = None
+        _LOGGER.debug("Renewing Anthem token for %s in the background", self._host)
+        self._start_authentication()
+
     async def _ensure_token(self) -> str:
-        """Return a valid token, refreshing if needed."""
+        """Return a valid token, refreshing if needed.
+
+        Concurrent callers share a single login rather than each
+        authenticating against the hub.
+        """
         now = time.time()
         if self._token and self._token_exp > (now + TOKEN_EXPIRY_BUFFER):
             return self._token
-        return await self._authenticate()
+        return await asyncio.shield(self._start_authentication())
+
+    @property
+    def token(self) -> tuple[str, float] | None:
+        """Return the current token and its expiry, if any."""
+        if self._token is None:
+            return None
+        return self._token, self._token_exp
+
+    def restore_token(self, token: str, token_exp: float) -> bool:
+        """Adopt a previously issued token if it is still valid."""
+        if not self._pin or token_exp <= time.time() + TOKEN_EXPIRY_BUFFER:
+            return False
+        self._token = token
+        self._token_exp = token_exp
+        self._schedule_renewal()
+        return True
 
     def invalidate_token(self) -> None:
         """Force re-auth on next request."""
+        self._cancel_renewal()
         self._token = None
         self._token_exp = 0
 
-    async def get_running_state(self) -> dict:
-        """Poll the hub for its running state.
+    def start_capture(self, path: str) -> None:
+        """Append this client's traffic to a JSONL file from now on.
 
-        Returns dict with keys:
-          running: bool
-          device_names: list[str]
+        The PIN and tokens are redacted; see TrafficCapture. A capture
+        already running is kept.
         """
-        # If no PIN is configured, use the unauthenticated endpoint
-        if self._pin is None:
-            return await self._get_running_state_unauthenticated()
-
-        # Otherwise use authenticated endpoint
-        token = await self._ensure_token()
-        url = f"{self._base_url}/get_hub_running_state"
-
-        try:
-            async with self._session.get(
-                url, headers=self._common_headers(token), timeout=aiohttp.ClientTimeout(total=10)
-            ) as resp:
-                if resp.status == 403:
-                    self.invalidate_token()
-                    raise AnthemAuthError("Token rejected (403)")
-                data = await resp.json(content_type=None)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise AnthemConnectionError(f"Status request failed: {err}") from err
-
-        if not isinstance(data, dict):
-            raise AnthemConnectionError(f"Unexpected response: {data}")
-
-        if data.get("error") == "Unauthorised token":
+        if self.capture is None:
+            self.capture = TrafficCapture(path, self._host)
+
+    async def async_stop_capture(self) -> None:
+        """Stop capturing and wait for the capture to be written."""
+        if (capture := self.capture) is not None:
+            self.capture = None
+            await capture.async_close()
+
+    async def async_close(self) -> None:
+        """Cancel background token renewal, finish a capture and close an owned session."""
+        self._cancel_renewal()
+        if self._auth_task is not None:
+            self._auth_task.cancel()
+        await self.async_stop_capture()
+        if self._owns_session:
+            await self._session.close()
+
+    async def _request(
+        self,
+        method: str,
+        endpoint: str,
+        payload: dict | None = None,
+        *,
+        authenticated: bool = True,
+        retries: int = 0,
+    ) -> dict:
+        """Send a request through the shared pipeline and return the reply.
+
+        A rejected token triggers one re-login and retry here, so callers
+        only see TokenRejected when the fresh token is rejected as well. A
+        failed login is not retried.
+        Connection failures are retried up to ``retries`` more times, which
+        only idempotent reads should ask for.
+        """
+        attempt = 0
+        reauthenticated = False
+        while True:
+            try:
+                return await self._send(
+                    method,
+                    endpoint,
+                    payload,
+                    authenticated=authenticated,
+                    retry=attempt > 0 or reauthenticated,
+                )
+            except TokenRejected:
+                if reauthenticated:
+                    raise
+                reauthenticated = True
+                _LOGGER.debug("Anthem token rejected on %s, logging in again", endpoint)
+            except AnthemConnectionError:
+                if attempt >= retries:
+                    raise
+                attempt += 1
+                _LOGGER.debug("Retrying %s (attempt %s)", endpoint, attempt + 1)
+
+    async def _send(
+        self,
+        method: str,
+        endpoint: str,
+        payload: dict | None,
+        *,
+        authenticated: bool,
+        retry: bool = False,
+    ) -> dict:
+        """Send one request to the hub and decode its JSON reply.
+
+        While the circuit breaker is open this fails fast instead of
+        waiting for the hub to time out. ``retry`` marks a repeated
+        request in a traffic capture.
+        """
+        token = await self._ensure_token() if authenticated else None
+        if not self.breaker.allow_request():
+            raise AnthemConnectionError(
+                f"Hub at {self._host} is unreachable, next attempt in "
+                f"{self.breaker.retry_in:.0f} s"
+            )
+        url = f"{self._base_url}/{endpoint}"
+        capture = (
+            self.capture.exchange(
+                method, endpoint, payload, authenticated=authenticated, retry=retry
+            )
+            if self.capture is not None
+            else nullcontext(CapturedExchange())
+        )
+        with (
+            self.breaker.attempt(AnthemConnectionError),
+            self.metrics.measure(endpoint),
+            capture as exchange,
+        ):
+            try:
+                async with self._session.request(
+                    method, url, json=payload, headers=self._common_headers(token),
+                    timeout=self.request_timeout(endpoint),
+                ) as resp:
+                    exchange.status = resp.status
+                    if resp.status == 403:
+                        if token is None:
+                            raise AnthemAuthError("Request refused (403)")
+                        self._reject_token(token)
+                        raise TokenRejected("Token rejected (403)")
+                    data = exchange.reply = await resp.json(content_type=None)
+            except (aiohttp.ClientError, TimeoutError) as err:
+                raise AnthemConnectionError(f"Request to {endpoint} failed: {err}") from err
+            except ValueError as err:
+                # Something other than a hub answered, e.g. with an HTML page
+                raise AnthemConnectionError(f"Invalid reply from {endpoint}: {err}") from err
+
+            if not isinstance(data, dict):
+                raise AnthemConnectionError(f"Unexpected response: {data}")
+
+            if data.get("error") == "Unauthorised token":
+                if token is None:
+                    raise AnthemAuthError("Request refused: Unauthorised token")
+                self._reject_token(token)
+                raise TokenRejected("Token expired")
+
+        return data
+
+    def request_timeout(self, endpoint: str) -> aiohttp.ClientTimeout:
+        """Return the timeout for the next request to an endpoint."""
+        budget = self.poll_budget if endpoint == "get_hub_running_state" else self.command_budget
+        return budget.timeout(self.metrics.endpoints[endpoint])
+
+    def _reject_token(self, token: str) -> None:
+        """Drop a token the hub refused, unless it was already replaced."""
+        if token == self._token:
             self.invalidate_token()
-            raise AnthemAuthError("Token expired")
-
-        if data.get("status") == "false":
-            raise AnthemConnectionError(f"Hub returned error: {data}")
-
-        return {
-            "running": data.get("running") is True,
-            "device_names": data.get("devicename", []),
-        }
 
-    async def _get_running_state_unauthenticated(self) -> dict:
-        """Poll the hub for running state without authentication.
-
-        Only requires the random_uuid header.
+    async def get_running_state(self) -> HubState:
+        """Poll the hub for its running state.
 
-        Returns dict with keys:
-          running: bool
-          device_names: list[str]
+        Uses the unauthenticated endpoint (which only needs the random_uuid
+        header) when no PIN is configured.
         """
-        url = f"{self._base_url}/get_hub_running_state"
-
-        try:
-            async with self._session.get(
-                url, headers=self._common_headers(), timeout=aiohttp.ClientTimeout(total=10)
-            ) as resp:
-                data = await resp.json(content_type=None)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise AnthemConnectionError(f"Status request failed: {err}") from err
-
-        if not isinstance(data, dict):
-            raise AnthemConnectionError(f"Unexpected response: {data}")
+        data = await self._request(
+            "GET",
+            "get_hub_running_state",
+            authenticated=self._pin is not None,
+            retries=self.read_retries,
+        )
 
-        if data.get("error"):
+        if data.get("error") or data.get("status") == "false":
             raise AnthemConnectionError(f"Hub returned error: {data}")
 
-        return {
-            "running": data.get("running") is True,
-            "device_names": data.get("devicename", []),
-        }
+        return _parse_state(data)
 
-    async def start_water_test(self, temperature: float) -> None:
-        """Send water_test_start command."""
-        token = await self._ensure_token()
-        url = f"{self._base_url}/req_update_command"
-        payload = {
-            "req_command": "water_test_start",
-            "zone1": {
-                "temperature": temperature,
-                "flowRate": 100,
-                "outletState": [1, 0, 0, 0, 0, 0],
-            },
-        }
-        try:
-            async with self._session.post(
-                url, json=payload, headers=self._common_headers(token),
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as resp:
-                if resp.status == 403:
-                    self.invalidate_token()
-                    raise AnthemAuthError("Token rejected (403)")
-                data = await resp.json(content_type=None)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise AnthemConnectionError(f"Start command failed: {err}") from err
-
-        if isinstance(data, dict) and data.get("error") == "Unauthorised token":
-            self.invalidate_token()
-            raise AnthemAuthError("Token expired")
+    async def start_zones(self, zones: Iterable[ZoneState]) -> HubState | None:
+        """Send one water_test_start command covering several zones.
 
+        Returns the hub state if the reply carries one.
+        """
+        payload = build_start_payload(zones)
+        data = await self._request("POST", "req_update_command", payload)
         _LOGGER.debug("water_test_start response: %s", data)
+        return self._command_state(data)
 
-    async def stop_water_test(self) -> None:
-        """Send water_test_stop command."""
-        token = await self._ensure_token()
-        url = f"{self._base_url}/req_update_command"
-        payload = {"req_command": "water_test_stop"}
-        try:
-            async with self._session.post(
-                url, json=payload, headers=self._common_headers(token),
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as resp:
-                if resp.status == 403:
-                    self.invalidate_token()
-                    raise AnthemAuthError("Token rejected (403)")
-                data = await resp.json(content_type=None)
-        except (aiohttp.ClientError, TimeoutError) as err:
-            raise AnthemConnectionError(f"Stop command failed: {err}") from err
-
-        if isinstance(data, dict) and data.get("error") == "Unauthorised token":
-            self.invalidate_token()
-            raise AnthemAuthError("Token expired")
+    async def stop_water_test(self) -> HubState | None:
+        """Send water_test_stop command.
 
+        Returns the hub state if the reply carries one.
+        """
+        data = await self._request("POST", "req_update_command", {"req_command": "water_test_stop"})
         _LOGGER.debug("water_test_stop response: %s", data)
+        return self._command_state(data)
+
+    @staticmethod
+    def _command_state(data: dict) -> HubState | None:
+        if "running" not in data:
+            return None
+        return _parse_state(data)
 
     async def async_test_connection(self) -> bool:
         """Test that we can connect and poll. Used by config flow."""
@@ -52,14 +52,25 @@ class AnthemShowerBinarySensor(CoordinatorEntity[AnthemCoordinator], BinarySenso
         """Return True if the shower is running."""
         if self.coordinator.data is None:
             return None
-        return self.coordinator.data.get("running", False)
+        return self.coordinator.data.running
 
     @property
     def extra_state_attributes(self) -> dict | None:
-        """Return active device names as an attribute."""
+        """Return active devices, outlet states and other reported fields.
+
+        While the hub is unreachable but its last state is still served,
+        ``stale`` is set and ``data_age`` gives that state's age in seconds.
+        """
         if self.coordinator.data is None:
             return None
-        names = self.coordinator.data.get("device_names", [])
-        if names:
-            return {"active_devices": names}
-        return None
+        data = self.coordinator.data
+        attributes: dict = dict(data.extra)
+        if self.coordinator.stale and (age := self.coordinator.data_age) is not None:
+            attributes["stale"] = True
+            attributes["data_age"] = round(age)
+        if data.device_names:
+            attributes["active_devices"] = list(data.device_names)
+        for zone in data.zones:
+            if zone.outlets:
+                attributes[f"zone{zone.number}_outlets"] = list(zone.outlets)
+        return attributes or None
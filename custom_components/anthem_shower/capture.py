@@ -0,0 +1,163 @@
+"""Opt-in capture of Anthem Shower hub traffic for offline replay."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+import json
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+REDACTED = "**REDACTED**"
+CAPTURE_VERSION = 1
+
+
+@dataclass(slots=True)
+class CapturedExchange:
+    """What the client saw of one request, filled in as it progresses."""
+
+    status: int | None = None
+    reply: Any = None
+
+
+def token_ttl(token: str) -> float | None:
+    """Return seconds until a JWT expires, if it carries an expiry."""
+    try:
+        claims = json.loads(base64.b64decode(token.split(".")[1] + "=="))
+        return round(claims["exp"] - time.time(), 1)
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def _redact_request(payload: dict | None) -> dict | None:
+    if payload is None or "pin" not in payload:
+        return payload
+    return {**payload, "pin": REDACTED}
+
+
+def _redact_reply(reply: Any) -> Any:
+    """Replace a login token with its remaining lifetime."""
+    if not isinstance(reply, dict) or not isinstance(token := reply.get("token"), str):
+        return reply
+    return {**reply, "token": REDACTED, "token_ttl": token_ttl(token)}
+
+
+def _error_kind(err: BaseException) -> str | None:
+    """Classify why a request got no usable reply, None if it got one."""
+    cause = err.__cause__ or err
+    if isinstance(cause, TimeoutError):
+        return "timeout"
+    if isinstance(cause, aiohttp.ClientError):
+        return "connection"
+    if isinstance(cause, ValueError):
+        return "invalid_reply"
+    return None
+
+
+class TrafficCapture:
+    """Append a client's requests, replies and timings to a JSONL file.
+
+    The first line describes the capture; each further line is one
+    exchange with its offset from the start of the capture, round trip
+    time, status and decoded reply. The PIN is never written, and login
+    tokens are replaced by their remaining lifetime. Lines are buffered
+    and written in the executor, batched while a write is in progress,
+    so capturing never blocks the event loop.
+    """
+
+    def __init__(self, path: str, host: str) -> None:
+        """Start a capture of the traffic to one hub."""
+        self.path = path
+        self.exchanges = 0
+        self._started = time.monotonic()
+        self._lines = [
+            _dumps(
+                {"capture": CAPTURE_VERSION, "host": host, "started": round(time.time(), 3)}
+            )
+        ]
+        self._write_task: asyncio.Future[None] | None = None
+
+    @contextmanager
+    def exchange(
+        self,
+        method: str,
+        endpoint: str,
+        payload: dict | None,
+        *,
+        authenticated: bool,
+        retry: bool,
+    ) -> Iterator[CapturedExchange]:
+        """Record one request; the caller fills in the status and reply.
+
+        ``retry`` marks a request the client repeated on its own, after a
+        connection failure or a rejected token, so a replay issues only
+        the original call.
+        """
+        exchange = CapturedExchange()
+        start = time.monotonic()
+        error: str | None = None
+        try:
+            yield exchange
+        except Exception as err:
+            error = _error_kind(err)
+            raise
+        finally:
+            record: dict[str, Any] = {
+                "t": round(start - self._started, 4),
+                "method": method,
+                "endpoint": endpoint,
+                "elapsed": round(time.monotonic() - start, 4),
+            }
+            if payload is not None:
+                record["request"] = _redact_request(payload)
+            if authenticated:
+                record["auth"] = True
+            if retry:
+                record["retry"] = True
+            if error is not None:
+                record["error"] = error
+            else:
+                record["status"] = exchange.status
+                record["reply"] = _redact_reply(exchange.reply)
+            self._append(_dumps(record))
+
+    def _append(self, line: str) -> None:
+        self.exchanges += 1
+        self._lines.append(line)
+        if self._write_task is None:
+            self._schedule_write()
+
+    def _schedule_write(self) -> None:
+        lines, self._lines = self._lines, []
+        self._write_task = asyncio.get_running_loop().run_in_executor(None, self._write, lines)
+        self._write_task.add_done_callback(self._write_done)
+
+    def _write(self, lines: list[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("\n".join(lines) + "\n")
+
+    def _write_done(self, task: asyncio.Future[None]) -> None:
+        self._write_task = None
+        if not task.cancelled() and (err := task.exception()) is not None:
+            _LOGGER.warning("Could not write Anthem traffic capture %s: %s", self.path, err)
+        if self._lines:
+            self._schedule_write()
+
+    async def async_close(self) -> None:
+        """Wait until every recorded exchange is written."""
+        if self._write_task is None and self._lines:
+            self._schedule_write()
+        while (task := self._write_task) is not None:
+            await asyncio.wait([task])
+
+
+def _dumps(record: dict[str, Any]) -> str:
+    return json.dumps(record, separators=(",", ":"))
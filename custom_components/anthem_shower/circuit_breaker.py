@@ -0,0 +1,129 @@
+"""Circuit breaker for the Anthem Shower API client."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from enum import StrEnum
+import logging
+import time
+
+from .const import BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class BreakerState(StrEnum):
+    """State of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast while a hub is unreachable.
+
+    After ``threshold`` consecutive connection failures the breaker opens
+    and requests are refused without touching the network. Once
+    ``reset_timeout`` has passed a single probe request is let through;
+    its success closes the breaker and its failure opens it again.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+    ) -> None:
+        """Initialise a closed breaker."""
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.trips = 0
+        self.rejected = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> BreakerState:
+        """Return the current state."""
+        if self._opened_at is None:
+            return BreakerState.CLOSED
+        if self._probing or self.retry_in == 0:
+            return BreakerState.HALF_OPEN
+        return BreakerState.OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return seconds until the next probe is allowed."""
+        if self._opened_at is None:
+            return 0
+        return max(0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def reset(self) -> None:
+        """Close the breaker, e.g. once the hub has a new address."""
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def allow_request(self) -> bool:
+        """Return whether a request may go to the hub now."""
+        if self._opened_at is None:
+            return True
+        if self._probing or self.retry_in > 0:
+            self.rejected += 1
+            return False
+        self._probing = True
+        return True
+
+    @contextmanager
+    def attempt(self, failure: type[Exception]) -> Iterator[None]:
+        """Record the outcome of one request let through by allow_request.
+
+        ``failure`` is the exception meaning the hub could not be reached;
+        any other reply, including an error, shows the hub is up.
+        """
+        try:
+            yield
+        except failure:
+            self._record_failure()
+            raise
+        except asyncio.CancelledError:
+            self._probing = False
+            raise
+        except Exception:
+            self._record_success()
+            raise
+        self._record_success()
+
+    def _record_success(self) -> None:
+        if self._opened_at is not None:
+            _LOGGER.info("Anthem hub at %s is reachable again", self.name)
+        self.reset()
+
+    def _record_failure(self) -> None:
+        self.failures += 1
+        if self._opened_at is None and self.failures < self.threshold:
+            return
+        if self._opened_at is None:
+            self.trips += 1
+            _LOGGER.warning(
+                "Anthem hub at %s unreachable after %s attempts, pausing requests",
+                self.name,
+                self.failures,
+            )
+        self._opened_at = time.monotonic()
+        self._probing = False
+
+    def as_dict(self) -> dict[str, str | int | float]:
+        """Return a summary for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "retry_in": round(self.retry_in, 1),
+        }
@@ -2,33 +2,100 @@
 
 from __future__ import annotations
 
+import asyncio
+import ipaddress
 import logging
 from typing import Any
 
 import voluptuous as vol
 
 from homeassistant.components import zeroconf
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import AnthemApiClient, AnthemAuthError, AnthemConnectionError
 from .const import (
+    COMMAND_TIMEOUT_MAX,
+    CONF_CAPTURE_TRAFFIC,
+    CONF_COMMAND_TIMEOUT,
     CONF_HOST,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MIN_SCAN_INTERVAL,
     CONF_PIN,
+    CONF_POLL_TIMEOUT,
+    CONF_READ_RETRIES,
     CONF_SCAN_INTERVAL,
+    CONF_STALE_TTL,
+    DATA_PENDING_TOKENS,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_READ_RETRIES,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_TTL,
     DOMAIN,
+    POLL_TIMEOUT_MAX,
+    SCAN_MAX_HOSTS,
 )
+from .discovery import async_get_probe_cache, async_scan_network
 
 _LOGGER = logging.getLogger(__name__)
 
+POLLING_SCHEMA = {
+    vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
+        int, vol.Range(min=10, max=300)
+    ),
+    vol.Optional(CONF_MIN_SCAN_INTERVAL, default=DEFAULT_MIN_SCAN_INTERVAL): vol.All(
+        int, vol.Range(min=2, max=60)
+    ),
+    vol.Optional(CONF_MAX_SCAN_INTERVAL, default=DEFAULT_MAX_SCAN_INTERVAL): vol.All(
+        int, vol.Range(min=60, max=3600)
+    ),
+    vol.Optional(CONF_STALE_TTL, default=DEFAULT_STALE_TTL): vol.All(
+        int, vol.Range(min=0, max=3600)
+    ),
+}
+
+OPTIONS_SCHEMA = vol.Schema(
+    {
+        **POLLING_SCHEMA,
+        vol.Optional(CONF_POLL_TIMEOUT, default=POLL_TIMEOUT_MAX): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=30)
+        ),
+        vol.Optional(CONF_COMMAND_TIMEOUT, default=COMMAND_TIMEOUT_MAX): vol.All(
+            vol.Coerce(float), vol.Range(min=2, max=60)
+        ),
+        vol.Optional(CONF_READ_RETRIES, default=DEFAULT_READ_RETRIES): vol.All(
+            int, vol.Range(min=0, max=3)
+        ),
+        vol.Optional(CONF_CAPTURE_TRAFFIC, default=False): bool,
+    }
+)
+
 STEP_USER_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_HOST): str,
         vol.Optional(CONF_PIN): str,
-        vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
-            int, vol.Range(min=10, max=300)
-        ),
+        **POLLING_SCHEMA,
+    }
+)
+
+CONF_NETWORK = "network"
+
+# TXT record keys that may carry a hub's serial number or MAC address
+ZEROCONF_ID_PROPERTIES = ("serial", "serialno", "sn", "mac", "macaddress")
+
+STEP_SCAN_DATA_SCHEMA = vol.Schema({vol.Required(CONF_NETWORK): str})
+
+STEP_ZEROCONF_CONFIRM_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_PIN): str,
+        **POLLING_SCHEMA,
     }
 )
 
@@ -38,41 +105,164 @@ class AnthemShowerConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialise the flow."""
+        self._network: ipaddress.IPv4Network | None = None
+        self._scan_task: asyncio.Task[None] | None = None
+        self._found_hosts: list[str] = []
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> AnthemShowerOptionsFlow:
+        """Return the options flow."""
+        return AnthemShowerOptionsFlow()
+
+    @callback
+    def _async_hand_over_token(self, host: str, client: AnthemApiClient) -> None:
+        """Pass the token from a successful test on to the runtime client."""
+        if token := client.token:
+            self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_PENDING_TOKENS, {})[host] = token
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle the initial step."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "scan"])
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle a host entered by the user."""
         errors: dict[str, str] = {}
 
         if user_input is not None:
-            host = user_input[CONF_HOST]
-            pin = user_input.get(CONF_PIN) or None  # Convert empty string to None
-
             # Prevent duplicate entries for the same host
-            self._async_abort_entries_match({CONF_HOST: host})
+            self._async_abort_entries_match({CONF_HOST: user_input[CONF_HOST]})
+            errors = await self._async_validate_input(user_input)
+            if not errors:
+                return self._async_create_hub_entry(user_input)
 
-            session = async_get_clientsession(self.hass)
-            client = AnthemApiClient(host, pin, session)
+        return self.async_show_form(
+            step_id="manual",
+            data_schema=STEP_USER_DATA_SCHEMA,
+            errors=errors,
+        )
 
-            try:
+    async def _async_validate_input(self, user_input: dict[str, Any]) -> dict[str, str]:
+        """Test a host and PIN, returning form errors.
+
+        Without a PIN a recent probe of the host, e.g. from discovery or a
+        scan, is reused.
+        """
+        host = user_input[CONF_HOST]
+        pin = user_input.get(CONF_PIN) or None  # Convert empty string to None
+
+        session = async_get_clientsession(self.hass)
+        client = AnthemApiClient(host, pin, session)
+
+        try:
+            if pin is None:
+                await async_get_probe_cache(self.hass).async_probe(session, host)
+            else:
                 await client.async_test_connection()
-            except AnthemAuthError:
-                errors["base"] = "invalid_auth"
-            except AnthemConnectionError:
-                errors["base"] = "cannot_connect"
-            except Exception:
-                _LOGGER.exception("Unexpected error during config flow")
-                errors["base"] = "unknown"
+        except AnthemAuthError:
+            return {"base": "invalid_auth"}
+        except AnthemConnectionError:
+            return {"base": "cannot_connect"}
+        except Exception:
+            _LOGGER.exception("Unexpected error during config flow")
+            return {"base": "unknown"}
+        else:
+            self._async_hand_over_token(host, client)
+        finally:
+            await client.async_close()
+        return {}
+
+    @callback
+    def _async_create_hub_entry(self, user_input: dict[str, Any]) -> ConfigFlowResult:
+        return self.async_create_entry(
+            title=f"Anthem Shower ({user_input[CONF_HOST]})",
+            data=user_input,
+        )
+
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Ask which network to scan for hubs."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            try:
+                network = ipaddress.IPv4Network(user_input[CONF_NETWORK], strict=False)
+            except ValueError:
+                errors[CONF_NETWORK] = "invalid_network"
             else:
-                return self.async_create_entry(
-                    title=f"Anthem Shower ({host})",
-                    data=user_input,
-                )
+                if network.num_addresses > SCAN_MAX_HOSTS:
+                    errors[CONF_NETWORK] = "network_too_large"
+                else:
+                    self._network = network
+                    return await self.async_step_scan_progress()
 
         return self.async_show_form(
-            step_id="user",
-            data_schema=STEP_USER_DATA_SCHEMA,
+            step_id="scan",
+            data_schema=STEP_SCAN_DATA_SCHEMA,
+            errors=errors,
+            description_placeholders={"max_hosts": str(SCAN_MAX_HOSTS)},
+        )
+
+    async def async_step_scan_progress(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Scan the network in the background while showing progress."""
+        assert self._network is not None
+        if self._scan_task is None:
+            self._scan_task = self.hass.async_create_task(self._async_scan(self._network))
+        if not self._scan_task.done():
+            return self.async_show_progress(
+                step_id="scan_progress",
+                progress_action="scan",
+                progress_task=self._scan_task,
+                description_placeholders={"network": str(self._network)},
+            )
+        self._scan_task = None
+        return self.async_show_progress_done(next_step_id="scan_results")
+
+    async def _async_scan(self, network: ipaddress.IPv4Network) -> None:
+        configured = {entry.data[CONF_HOST] for entry in self._async_current_entries()}
+        session = async_get_clientsession(self.hass)
+        self._found_hosts = []
+        async for host in async_scan_network(session, network):
+            if host not in configured:
+                self._found_hosts.append(host)
+
+    async def async_step_scan_results(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Let the user pick one of the hubs the scan found."""
+        if not self._found_hosts:
+            return self.async_abort(reason="no_devices_found")
+
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            self._async_abort_entries_match({CONF_HOST: user_input[CONF_HOST]})
+            errors = await self._async_validate_input(user_input)
+            if not errors:
+                return self._async_create_hub_entry(user_input)
+
+        return self.async_show_form(
+            step_id="scan_results",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_HOST): vol.In(
+                        sorted(self._found_hosts, key=ipaddress.ip_address)
+                    ),
+                    vol.Optional(CONF_PIN): str,
+                    **POLLING_SCHEMA,
+                }
+            ),
             errors=errors,
+            description_placeholders={"count": str(len(self._found_hosts))},
         )
 
     async def async_step_zeroconf(
@@ -82,19 +272,32 @@ class AnthemShowerConfigFlow(ConfigFlow, domain=DOMAIN):
         # Extract host from discovery info
         host = discovery_info.host
 
-        # Prevent duplicate entries for the same host
-        await self.async_set_unique_id(host)
-        self._abort_if_unique_id_configured()
+        if (hub_id := _hub_id(discovery_info)) is None:
+            # Without a serial or MAC the hub can only be told apart by host
+            await self.async_set_unique_id(host)
+            self._abort_if_unique_id_configured()
+        else:
+            # Entries from before hubs had a stable id are keyed by their host
+            for entry in self._async_current_entries(include_ignore=False):
+                if entry.unique_id in (None, host) and entry.data[CONF_HOST] == host:
+                    self.hass.config_entries.async_update_entry(entry, unique_id=hub_id)
+
+            # A configured hub that changed address is followed in place; the
+            # entry's update listener repoints the running client
+            await self.async_set_unique_id(hub_id)
+            self._abort_if_unique_id_configured(
+                updates={CONF_HOST: host}, reload_on_update=False
+            )
 
         # Store the discovered host for confirmation step
         self.context["title_placeholders"] = {"host": host}
 
-        # Verify we can reach the device
+        # Verify we can reach the device; repeated announcements of the same
+        # host share one probe
         session = async_get_clientsession(self.hass)
-        client = AnthemApiClient(host, None, session)
 
         try:
-            await client.async_test_connection()
+            await async_get_probe_cache(self.hass).async_probe(session, host)
         except (AnthemAuthError, AnthemConnectionError):
             return self.async_abort(reason="cannot_connect")
         except Exception:
@@ -112,7 +315,6 @@ class AnthemShowerConfigFlow(ConfigFlow, domain=DOMAIN):
 
         if user_input is not None:
             pin = user_input.get(CONF_PIN) or None
-            scan_interval = user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
 
             # If PIN was provided, test it
             if pin:
@@ -124,35 +326,36 @@ class AnthemShowerConfigFlow(ConfigFlow, domain=DOMAIN):
                 except AnthemAuthError:
                     return self.async_show_form(
                         step_id="zeroconf_confirm",
-                        data_schema=vol.Schema({
-                            vol.Optional(CONF_PIN): str,
-                            vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
-                                int, vol.Range(min=10, max=300)
-                            ),
-                        }),
+                        data_schema=STEP_ZEROCONF_CONFIRM_DATA_SCHEMA,
                         errors={"base": "invalid_auth"},
                         description_placeholders={"host": host},
                     )
                 except Exception:
                     _LOGGER.exception("Unexpected error during PIN validation")
+                else:
+                    self._async_hand_over_token(host, client)
+                finally:
+                    await client.async_close()
 
             return self.async_create_entry(
                 title=f"Anthem Shower ({host})",
                 data={
                     CONF_HOST: host,
                     CONF_PIN: pin,
-                    CONF_SCAN_INTERVAL: scan_interval,
+                    CONF_SCAN_INTERVAL: user_input.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+                    CONF_MIN_SCAN_INTERVAL: user_input.get(
+                        CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL
+                    ),
+                    CONF_MAX_SCAN_INTERVAL: user_input.get(
+                        CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                    ),
+                    CONF_STALE_TTL: user_input.get(CONF_STALE_TTL, DEFAULT_STALE_TTL),
                 },
             )
 
         return self.async_show_form(
             step_id="zeroconf_confirm",
-            data_schema=vol.Schema({
-                vol.Optional(CONF_PIN): str,
-                vol.Optional(CONF_SCAN_INTERVAL, default=DEFAULT_SCAN_INTERVAL): vol.All(
-                    int, vol.Range(min=10, max=300)
-                ),
-            }),
+            data_schema=STEP_ZEROCONF_CONFIRM_DATA_SCHEMA,
             description_placeholders={"host": host},
         )
 
@@ -187,10 +390,13 @@ class AnthemShowerConfigFlow(ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected error during reauth")
                 errors["base"] = "unknown"
             else:
+                self._async_hand_over_token(host, client)
                 return self.async_update_reload_and_abort(
                     reauth_entry,
                     data={**reauth_entry.data, CONF_PIN: new_pin},
                 )
+            finally:
+                await client.async_close()
 
         return self.async_show_form(
             step_id="reauth_confirm",
@@ -200,3 +406,37 @@ class AnthemShowerConfigFlow(ConfigFlow, domain=DOMAIN):
                 "host": reauth_entry.data[CONF_HOST],
             },
         )
+
+
+class AnthemShowerOptionsFlow(OptionsFlow):
+    """Tune polling, timeouts and retries of a configured hub.
+
+    Saved options are applied to the running client and coordinator by
+    the entry's update listener, without a reload.
+    """
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Show the current settings for editing."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=self.add_suggested_values_to_schema(
+                OPTIONS_SCHEMA, {**self.config_entry.data, **self.config_entry.options}
+            ),
+        )
+
+
+def _hub_id(discovery_info: zeroconf.ZeroconfServiceInfo) -> str | None:
+    """Return an identifier for a discovered hub that survives DHCP changes.
+
+    Only a serial number or MAC address from the TXT record qualifies; the
+    mDNS instance name can be renamed or deduplicated by the responder.
+    """
+    for key in ZEROCONF_ID_PROPERTIES:
+        if value := discovery_info.properties.get(key):
+            return str(value).replace(":", "").lower()
+    return None
@@ -2,11 +2,100 @@
 
 DOMAIN = "anthem_shower"
 
+# Keys in hass.data[DOMAIN] that are not config entry ids
+DATA_PENDING_TOKENS = "pending_tokens"
+DATA_SCHEDULER = "scheduler"
+DATA_PROBE_CACHE = "probe_cache"
+
+EVENT_RUNNING_CHANGED = f"{DOMAIN}_running_changed"
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10  # seconds
+
+# Traffic capture, written to the config directory
+CAPTURE_FILENAME = "anthem_shower_capture_{entry_id}.jsonl"
+
 CONF_HOST = "host"
 CONF_PIN = "pin"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_STALE_TTL = "stale_ttl"
+CONF_POLL_TIMEOUT = "poll_timeout"
+CONF_COMMAND_TIMEOUT = "command_timeout"
+CONF_READ_RETRIES = "read_retries"
+CONF_CAPTURE_TRAFFIC = "capture_traffic"
 
 DEFAULT_SCAN_INTERVAL = 60
+DEFAULT_MIN_SCAN_INTERVAL = 5
+DEFAULT_MAX_SCAN_INTERVAL = 300
+DEFAULT_STALE_TTL = 120  # seconds the last good state is kept through failed polls
+DEFAULT_READ_RETRIES = 0
+
+# Services
+SERVICE_APPLY_PRESET = "apply_preset"
+SERVICE_GROUP_CONTROL = "group_control"
+ATTR_ACTION = "action"
+ACTION_START = "start"
+ACTION_STOP = "stop"
+GROUP_MAX_CONCURRENT = 8  # hubs commanded at once by group_control
+ATTR_ZONES = "zones"
+ATTR_ZONE = "zone"
+ATTR_TEMPERATURE = "temperature"
+ATTR_FLOW_RATE = "flow_rate"
+ATTR_OUTLETS = "outlets"
+ATTR_START = "start"
+
+# Shower defaults
+DEFAULT_TARGET_TEMPERATURE = 100.0
+DEFAULT_FLOW_RATE = 100.0
+DEFAULT_OUTLET_STATE = (1, 0, 0, 0, 0, 0)
+OUTLET_COUNT = len(DEFAULT_OUTLET_STATE)
+
+# Adaptive polling
+ACTIVE_POLL_WINDOW = 60  # seconds of fast polling after a valve command
+IDLE_BACKOFF_FACTOR = 1.5
+ERROR_BACKOFF_FACTOR = 2.0
+
+# Confirmation polls after a valve command
+CONFIRM_POLL_INTERVAL = 1.0  # seconds
+CONFIRM_POLL_ATTEMPTS = 5
+
+# Quiet period before slider changes are pushed to a running shower
+LIVE_UPDATE_DELAY = 0.75  # seconds
+
+# Domain-wide poll scheduling
+FLEET_MAX_CONCURRENT_POLLS = 8
+FLEET_PHASE_SPACING = 0.5  # seconds between hub start phases
+FLEET_JITTER = 0.1  # +/- fraction applied to each poll interval
+FLEET_THROUGHPUT_WINDOW = 300  # seconds
+
+# Network scan for hubs that zeroconf can't see
+SCAN_CONCURRENCY = 64  # probes in flight at once
+SCAN_HOST_TIMEOUT = 1.0  # seconds per probed address
+SCAN_MAX_HOSTS = 1024  # largest network the scan accepts (a /22)
+
+# Discovery probes shared by config flows
+PROBE_CACHE_TTL = 30  # seconds a probe result is reused
+
+# Circuit breaker for unreachable hubs
+BREAKER_FAILURE_THRESHOLD = 3  # consecutive connection failures before opening
+BREAKER_RESET_TIMEOUT = 30  # seconds between probes while open
+
+# Adaptive request timeouts, derived from observed round trips
+TIMEOUT_MIN_SAMPLES = 5  # round trips needed before adapting
+POLL_TIMEOUT_MIN = 0.5  # seconds
+POLL_TIMEOUT_MAX = 10  # seconds
+POLL_TIMEOUT_FACTOR = 4.0
+COMMAND_TIMEOUT_MIN = 1.5  # seconds
+COMMAND_TIMEOUT_MAX = 15  # seconds
+COMMAND_TIMEOUT_FACTOR = 6.0
+
+# Shower session history
+SESSION_HISTORY_SIZE = 500  # most recent sessions kept
+
+# Request metrics
+METRICS_SAMPLE_SIZE = 256  # latency samples kept per endpoint
 
 # RSA public key used by Anthem devices to encrypt the PIN
 ANTHEM_RSA_PUBLIC_KEY_PEM = """-----BEGIN RSA PUBLIC KEY-----
@@ -2,57 +2,512 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections.abc import Iterable
+from dataclasses import replace
+from datetime import datetime, timedelta
+from enum import StrEnum
 import logging
+import random
+import time
+from typing import Any
 
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed, HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import AnthemApiClient, AnthemAuthError, AnthemConnectionError
+from .const import (
+    ACTIVE_POLL_WINDOW,
+    CONFIRM_POLL_ATTEMPTS,
+    CONFIRM_POLL_INTERVAL,
+    DEFAULT_FLOW_RATE,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_OUTLET_STATE,
+    DEFAULT_STALE_TTL,
+    DEFAULT_TARGET_TEMPERATURE,
+    DOMAIN,
+    ERROR_BACKOFF_FACTOR,
+    EVENT_RUNNING_CHANGED,
+    IDLE_BACKOFF_FACTOR,
+    LIVE_UPDATE_DELAY,
+    OUTLET_COUNT,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .history import SessionHistory, ShowerSession, async_publish_statistics
+from .models import HubState, ZoneState
+from .request_queue import AnthemRequestQueue, CommandSupersededError, StalePollError
+from .scheduler import AnthemPollScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class AnthemCoordinator(DataUpdateCoordinator[dict]):
-    """Coordinator that polls the Anthem hub."""
+class PollMode(StrEnum):
+    """Polling mode of the adaptive scheduler."""
+
+    ACTIVE = "active"
+    IDLE = "idle"
+    ERROR = "error"
+
+
+class AnthemCoordinator(DataUpdateCoordinator[HubState]):
+    """Coordinator that polls the Anthem hub.
+
+    The poll interval adapts to the hub: it polls at the minimum interval
+    while the shower is running or shortly after a valve command, backs off
+    gradually towards the configured scan interval while idle, and backs off
+    exponentially (with jitter) up to the maximum interval while polls fail.
+
+    Entities are only notified when the reported state actually changes,
+    and hub-reported running transitions fire EVENT_RUNNING_CHANGED.
+
+    When polls fail, the last good state keeps being served, flagged as
+    stale, for up to ``stale_ttl`` seconds. Entities only become
+    unavailable after that.
+    """
 
     def __init__(
         self,
         hass: HomeAssistant,
         client: AnthemApiClient,
         scan_interval: int,
+        min_interval: int = DEFAULT_MIN_SCAN_INTERVAL,
+        max_interval: int = DEFAULT_MAX_SCAN_INTERVAL,
+        stale_ttl: int = DEFAULT_STALE_TTL,
+        *,
+        entry_id: str,
+        scheduler: AnthemPollScheduler,
     ) -> None:
         """Initialise the coordinator."""
         super().__init__(
             hass,
             _LOGGER,
             name="Anthem Shower",
-            update_interval=timedelta(seconds=scan_interval),
+            update_interval=timedelta(seconds=min_interval),
+            always_update=False,
         )
+        self.entry_id = entry_id
         self.client = client
-        self.target_temperature: float = 100.0
+        self.scheduler = scheduler
+        self.queue = AnthemRequestQueue(client, scheduler.poll_slot)
+        self.zone_settings: dict[int, ZoneState] = {
+            1: ZoneState(1, DEFAULT_TARGET_TEMPERATURE, DEFAULT_FLOW_RATE, DEFAULT_OUTLET_STATE)
+        }
+        self.poll_mode = PollMode.ACTIVE
+        self._set_limits(scan_interval, min_interval, max_interval)
+        self._interval = self._min_interval
+        self._failures = 0
+        self._active_until = 0.0
+        self._stale_ttl = stale_ttl
+        self._last_reported: float | None = None
+        self.stale = False
+        self._store: Store[dict] = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+        self._saved_token: tuple[str, float] | None = None
+        self._reported: HubState | None = None
+        self._expected_running: bool | None = None
+        self._confirm_task: asyncio.Task[None] | None = None
+        self._live_update_unsub: CALLBACK_TYPE | None = None
+        self.history = SessionHistory()
+        self._history_store: Store[dict] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.history"
+        )
+        self._session_start: float | None = None
+        self._session_temperature: float | None = None
+        self._session_devices: dict[str, None] = {}
+
+    async def async_restore(self) -> bool:
+        """Load the cached token, last known state and session history.
+
+        Returns True if a state snapshot was restored, in which case the
+        caller can set up entities immediately and refresh in the background.
+        """
+        if history := await self._history_store.async_load():
+            self.history = SessionHistory.from_dict(history)
+        if not (stored := await self._store.async_load()):
+            return False
+        if (token := stored.get("token")) and self.client.restore_token(
+            token, stored.get("token_exp", 0)
+        ):
+            self._saved_token = self.client.token
+        if zones := stored.get("zone_settings"):
+            self.zone_settings = {
+                int(number): ZoneState.from_dict(int(number), zone)
+                for number, zone in zones.items()
+            }
+        if (data := stored.get("data")) is None:
+            return False
+        self.data = self._reported = HubState.from_dict(data)
+        return True
+
+    def _storage_data(self) -> dict:
+        token = self.client.token
+        return {
+            "token": token[0] if token else None,
+            "token_exp": token[1] if token else 0,
+            "data": self._reported.as_dict() if self._reported else None,
+            "zone_settings": {
+                str(number): zone.as_dict() for number, zone in self.zone_settings.items()
+            },
+        }
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        self._saved_token = self.client.token
+        self._store.async_delay_save(self._storage_data, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _async_record_report(self, state: HubState) -> None:
+        """Note a state reported by the hub, announcing and persisting changes."""
+        previous = self._reported
+        self._reported = state
+        if previous is not None and previous.running != state.running:
+            self.hass.bus.async_fire(
+                EVENT_RUNNING_CHANGED,
+                {
+                    "entry_id": self.entry_id,
+                    "running": state.running,
+                    "device_names": list(state.device_names),
+                },
+            )
+        self._async_track_session(state)
+        if state != previous or self.client.token != self._saved_token:
+            self._async_schedule_save()
+
+    @callback
+    def _async_track_session(self, state: HubState) -> None:
+        """Follow a shower session and record it once the hub reports a stop."""
+        if state.running:
+            if self._session_start is None:
+                self._session_start = time.time()
+                self._session_temperature = self.target_temperature
+                self._session_devices = {}
+            self._session_devices.update(dict.fromkeys(state.device_names))
+            return
+        if self._session_start is None:
+            return
+        self.history.append(
+            ShowerSession(
+                start=self._session_start,
+                end=time.time(),
+                temperature=self._session_temperature,
+                device_names=tuple(self._session_devices),
+            )
+        )
+        self._session_start = None
+        self._history_store.async_delay_save(self.history.as_dict, STORAGE_SAVE_DELAY)
+        async_publish_statistics(self.hass, self.entry_id, self.history)
+
+    @property
+    def target_temperature(self) -> float:
+        """Return the target temperature of zone 1."""
+        if (zone := self.zone_settings.get(1)) is None or zone.temperature is None:
+            return DEFAULT_TARGET_TEMPERATURE
+        return zone.temperature
+
+    @target_temperature.setter
+    def target_temperature(self, value: float) -> None:
+        self.async_update_zone(1, temperature=value)
+
+    @property
+    def zone_numbers(self) -> list[int]:
+        """Return every zone that is configured or reported by the hub."""
+        numbers = set(self.zone_settings)
+        if self.data is not None:
+            numbers.update(zone.number for zone in self.data.zones)
+        return sorted(numbers)
+
+    @callback
+    def async_update_zone(self, number: int, **changes: Any) -> None:
+        """Change the settings used for a zone the next time water starts."""
+        zone = self.zone_settings.get(number) or ZoneState(
+            number, DEFAULT_TARGET_TEMPERATURE, DEFAULT_FLOW_RATE, (0,) * OUTLET_COUNT
+        )
+        self.zone_settings[number] = replace(zone, **changes)
+        self._async_schedule_save()
+
+    @callback
+    def async_schedule_live_update(self) -> None:
+        """Push changed zone settings to a running shower once they settle.
+
+        Each call restarts the delay, so dragging a slider sends a single
+        command with the final value rather than one per step.
+        """
+        if self.data is None or not self.data.running:
+            return
+        if self._live_update_unsub is not None:
+            self._live_update_unsub()
+        self._live_update_unsub = async_call_later(
+            self.hass, LIVE_UPDATE_DELAY, self._async_push_live_update
+        )
+
+    async def _async_push_live_update(self, _now: datetime) -> None:
+        self._live_update_unsub = None
+        if self.data is None or not self.data.running:
+            return
+        try:
+            await self.async_start_shower()
+        except (AnthemAuthError, AnthemConnectionError, HomeAssistantError) as err:
+            _LOGGER.warning("Could not update the running shower: %s", err)
+
+    async def async_set_outlet(self, zone: int, outlet: int, on: bool) -> None:
+        """Turn one outlet on or off, resending all zones in one command."""
+        settings = self.zone_settings.get(zone)
+        outlets = list(settings.outlets if settings else ())
+        outlets += [0] * (OUTLET_COUNT - len(outlets))
+        outlets[outlet - 1] = int(on)
+        self.async_update_zone(zone, outlets=tuple(outlets))
+        if not any(any(zone.outlets) for zone in self.zone_settings.values()):
+            await self.async_stop_shower()
+        elif on or (self.data is not None and self.data.running):
+            await self.async_start_shower()
+
+    async def async_apply_preset(self, zones: Iterable[ZoneState], start: bool = True) -> None:
+        """Replace every zone's settings at once, optionally starting the water."""
+        self.zone_settings = {zone.number: zone for zone in zones}
+        self._async_schedule_save()
+        if start:
+            await self.async_start_shower()
+
+    async def async_start_shower(self, *, confirm: bool = True) -> bool:
+        """Start every configured zone and outlet in a single command.
+
+        Returns True if the hub's reply already reports the shower running,
+        False if not or if a newer command replaced this one before it was
+        sent.
+        """
+        zones = [zone for zone in self.zone_settings.values() if any(zone.outlets)]
+        if not zones:
+            raise HomeAssistantError("No outlets are enabled in any zone")
+        try:
+            reply = await self.queue.async_start_zones(zones)
+        except CommandSupersededError:
+            return False
+        return self._async_apply_command(True, reply, confirm)
+
+    async def async_stop_shower(self, *, confirm: bool = True) -> bool:
+        """Stop the shower.
+
+        Returns True if the hub's reply already reports the shower stopped,
+        False if not or if a newer command replaced this one before it was
+        sent.
+        """
+        try:
+            reply = await self.queue.async_stop_water_test()
+        except CommandSupersededError:
+            return False
+        return self._async_apply_command(False, reply, confirm)
+
+    @callback
+    def _async_apply_command(
+        self, running: bool, reply: HubState | None, confirm: bool = True
+    ) -> bool:
+        """Show the commanded state now and confirm it with the hub.
+
+        If the command reply already reports the new state, it is used
+        directly and no confirmation polls are needed. Without ``confirm``
+        the caller is left to refresh, e.g. once for a group of hubs.
+        """
+        self.async_boost()
+        if self._confirm_task is not None:
+            self._confirm_task.cancel()
+            self._confirm_task = None
+        # A newer command supersedes any optimistic state still awaiting the hub
+        self._expected_running = None
+        if reply is not None and reply.running is running:
+            self._async_record_report(reply)
+            self.async_set_updated_data(reply)
+            return True
+        if not confirm:
+            return False
+        last_reported = self._reported
+        self._expected_running = running
+        self.async_set_updated_data(replace(self.data or HubState(), running=running))
+        self._confirm_task = self.hass.async_create_background_task(
+            self._async_confirm(running, last_reported), "anthem_shower_confirm"
+        )
+        return False
+
+    async def _async_confirm(self, running: bool, last_reported: HubState | None) -> None:
+        """Poll briefly until the hub reports the commanded state.
+
+        Falls back to the last state the hub reported if it never does.
+        """
+        for _ in range(CONFIRM_POLL_ATTEMPTS):
+            await asyncio.sleep(CONFIRM_POLL_INTERVAL)
+            try:
+                last_reported = await self.queue.async_poll()
+            except (AnthemAuthError, AnthemConnectionError, StalePollError):
+                continue
+            self._async_record_report(last_reported)
+            if last_reported.running is running:
+                break
+        else:
+            _LOGGER.warning(
+                "Anthem hub did not confirm the shower %s, reverting",
+                "starting" if running else "stopping",
+            )
+        self._expected_running = None
+        self._confirm_task = None
+        if last_reported is not None:
+            self.async_set_updated_data(last_reported)
+
+    async def async_shutdown(self) -> None:
+        """Stop polling and drop queued hub requests."""
+        await super().async_shutdown()
+        if self._confirm_task is not None:
+            self._confirm_task.cancel()
+        if self._live_update_unsub is not None:
+            self._live_update_unsub()
+            self._live_update_unsub = None
+        await self.queue.async_close()
+
+    def _set_limits(self, scan_interval: float, min_interval: float, max_interval: float) -> None:
+        self._min_interval = float(min_interval)
+        self._max_interval = float(max(max_interval, min_interval))
+        self._idle_interval = min(max(float(scan_interval), self._min_interval), self._max_interval)
+
+    @callback
+    def async_apply_settings(
+        self, scan_interval: int, min_interval: int, max_interval: int, stale_ttl: int
+    ) -> None:
+        """Retune polling in place, keeping the cached state and token.
+
+        The current poll mode is kept and its interval clamped to the new
+        limits, and the next poll is rescheduled accordingly.
+        """
+        self._set_limits(scan_interval, min_interval, max_interval)
+        self._stale_ttl = stale_ttl
+        if self.poll_mode == PollMode.ACTIVE:
+            seconds = self._min_interval
+        elif self.poll_mode == PollMode.IDLE:
+            seconds = min(max(self._interval, self._min_interval), self._idle_interval)
+        else:
+            seconds = min(max(self._interval, self._min_interval), self._max_interval)
+        self._set_interval(self.poll_mode, seconds)
+        self._schedule_refresh()
+
+    @callback
+    def async_set_start_phase(self, delay: float) -> None:
+        """Offset the first scheduled poll by the hub's start phase.
+
+        Before any poll this replaces the wait until the first one, so the
+        poll the coordinator schedules for its first listener honours the
+        phase. After the setup poll the phase is added to the interval it
+        chose.
+        """
+        if self._last_reported is None:
+            seconds = delay
+        else:
+            seconds = self.update_interval.total_seconds() + delay
+        self.update_interval = timedelta(seconds=seconds)
+
+    @callback
+    def async_boost(self) -> None:
+        """Switch to fast polling, e.g. right after a valve command."""
+        self._active_until = time.monotonic() + ACTIVE_POLL_WINDOW
+        self._set_interval(PollMode.ACTIVE, self._min_interval)
+
+    def _set_interval(self, mode: PollMode, seconds: float) -> None:
+        if mode != self.poll_mode or seconds != self._interval:
+            _LOGGER.debug("Anthem poll mode %s, next poll in %.1fs", mode, seconds)
+        self.poll_mode = mode
+        self._interval = seconds
+        self.update_interval = timedelta(seconds=self.scheduler.jitter(seconds))
+
+    def _schedule_after_success(self, data: HubState) -> None:
+        if data.running or time.monotonic() < self._active_until:
+            self._set_interval(PollMode.ACTIVE, self._min_interval)
+            return
+        if self.poll_mode == PollMode.IDLE:
+            interval = self._interval * IDLE_BACKOFF_FACTOR
+        else:
+            interval = self._min_interval * IDLE_BACKOFF_FACTOR
+        self._set_interval(PollMode.IDLE, min(interval, self._idle_interval))
+
+    def _schedule_after_failure(self) -> None:
+        backoff = min(
+            self._min_interval * ERROR_BACKOFF_FACTOR ** self._failures,
+            self._max_interval,
+        )
+        # Equal jitter keeps several failing hubs from retrying in lockstep
+        self._set_interval(PollMode.ERROR, backoff / 2 + random.uniform(0, backoff / 2))
+
+    @property
+    def data_age(self) -> float | None:
+        """Return seconds since the hub last answered a poll."""
+        if self._last_reported is None:
+            return None
+        return time.monotonic() - self._last_reported
+
+    def _serve_stale(self, err: UpdateFailed) -> bool:
+        """Decide whether to keep the last good state through a failed poll."""
+        age = self.data_age
+        if self.data is None or age is None or age > self._stale_ttl:
+            self.stale = False
+            return False
+        if not self.stale:
+            _LOGGER.info(
+                "Polling the Anthem hub failed (%s), keeping the state from %.0f s ago",
+                err,
+                age,
+            )
+        self.stale = True
+        # The state itself hasn't changed, so refresh the staleness attributes
+        self.async_update_listeners()
+        return True
+
+    async def _async_update_data(self) -> HubState:
+        """Fetch running state and adapt the poll interval."""
+        try:
+            data = await self._async_fetch()
+        except StalePollError:
+            # A command went out mid-poll; keep what is shown until its own
+            # refresh, without taking it as a report from the hub
+            return self.data
+        except UpdateFailed as err:
+            self._failures += 1
+            self._schedule_after_failure()
+            if not self._serve_stale(err):
+                raise
+            return self.data
+        self._last_reported = time.monotonic()
+        if self.stale:
+            self.stale = False
+            self.async_update_listeners()
+        self._failures = 0
+        self._schedule_after_success(data)
+        self._async_record_report(data)
+        if self._expected_running is not None and data.running is not self._expected_running:
+            # Hub hasn't caught up with a command yet; keep the optimistic state
+            return self.data
+        return data
+
+    async def _async_fetch(self) -> HubState:
+        """Fetch running state from the hub.
 
-    async def _async_update_data(self) -> dict:
-        """Fetch running state from the hub."""
+        Raises StalePollError if a command superseded the poll while
+        there is already data to keep showing.
+        """
         try:
-            return await self.client.get_running_state()
-        except AnthemAuthError:
-            # Only handle auth errors if PIN is configured
-            # If PIN is not configured, this shouldn't happen
-            if self.client._pin:
-                # Token expired mid-cycle; retry once with fresh token
-                try:
-                    return await self.client.get_running_state()
-                except AnthemAuthError as err:
-                    # Two consecutive auth failures → PIN is likely invalid
-                    raise ConfigEntryAuthFailed(
-                        "Authentication failed. The PIN may have been changed on the hub."
-                    ) from err
-                except AnthemConnectionError as err:
-                    raise UpdateFailed(str(err)) from err
-            else:
+            return await self.queue.async_poll()
+        except StalePollError:
+            if self.data is not None:
+                raise
+            # Nothing to show yet, so poll again for the post-command state
+            return await self._async_fetch()
+        except AnthemAuthError as err:
+            if not self.client._pin:
                 # No PIN configured, shouldn't get auth errors
-                raise UpdateFailed("Unexpected authentication error without PIN configured")
+                raise UpdateFailed(
+                    "Unexpected authentication error without PIN configured"
+                ) from err
+            # The client already retried with a fresh login → PIN is likely invalid
+            raise ConfigEntryAuthFailed(
+                "Authentication failed. The PIN may have been changed on the hub."
+            ) from err
         except AnthemConnectionError as err:
             raise UpdateFailed(str(err)) from err
@@ -0,0 +1,55 @@
+"""Diagnostics support for Anthem Shower."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import aiohttp
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_PIN, DOMAIN
+from .coordinator import AnthemCoordinator
+from .metrics import ENDPOINTS
+
+TO_REDACT = {CONF_PIN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: AnthemCoordinator = hass.data[DOMAIN][entry.entry_id]
+    scheduler = coordinator.scheduler
+    return {
+        "entry": async_redact_data(entry.data, TO_REDACT),
+        "data": coordinator.data.as_dict() if coordinator.data else None,
+        "last_update_success": coordinator.last_update_success,
+        "stale": coordinator.stale,
+        "data_age": coordinator.data_age,
+        "poll_mode": coordinator.poll_mode,
+        "update_interval": coordinator.update_interval.total_seconds()
+        if coordinator.update_interval
+        else None,
+        "metrics": coordinator.client.metrics.as_dict(),
+        "circuit_breaker": coordinator.client.breaker.as_dict(),
+        "timeouts": {
+            endpoint: _timeout_dict(coordinator.client.request_timeout(endpoint))
+            for endpoint in ENDPOINTS
+        },
+        "scheduler": {
+            "hubs": scheduler.hub_count,
+            "polls_in_flight": scheduler.in_flight,
+            "polls_per_minute": scheduler.throughput,
+        },
+    }
+
+
+def _timeout_dict(timeout: aiohttp.ClientTimeout) -> dict[str, float | None]:
+    return {
+        "connect": timeout.sock_connect,
+        "read": timeout.sock_read,
+        "total": timeout.total,
+    }
@@ -0,0 +1,120 @@
+"""Discovery of Anthem Shower hubs: shared probes and network scans."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+import ipaddress
+import logging
+import time
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+
+from .api import AnthemApiClient, AnthemAuthError, AnthemConnectionError
+from .const import (
+    DATA_PROBE_CACHE,
+    DOMAIN,
+    PROBE_CACHE_TTL,
+    SCAN_CONCURRENCY,
+    SCAN_HOST_TIMEOUT,
+)
+from .models import HubState
+from .timeouts import TimeoutBudget
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AnthemProbeCache:
+    """Short-lived results of unauthenticated hub probes, keyed by host.
+
+    Hubs re-announce often and on several interfaces, so config flows
+    share one cache: concurrent probes of a host share a single request,
+    and a hub that answered is not probed again for ``ttl`` seconds.
+    Failures are not cached, so a hub that was just plugged in or a
+    corrected address is tried again straight away.
+    """
+
+    def __init__(self, ttl: float = PROBE_CACHE_TTL) -> None:
+        """Initialise an empty cache."""
+        self._ttl = ttl
+        self._results: dict[str, tuple[float, HubState]] = {}
+        self._in_flight: dict[str, asyncio.Task[HubState]] = {}
+
+    async def async_probe(self, session: aiohttp.ClientSession, host: str) -> HubState:
+        """Return the hub's state, raising AnthemConnectionError if unreachable.
+
+        Callers get AnthemAuthError if the hub refuses unauthenticated polls.
+        """
+        now = time.monotonic()
+        if (cached := self._results.get(host)) is not None and cached[0] > now:
+            return cached[1]
+        if (task := self._in_flight.get(host)) is None:
+            task = asyncio.create_task(self._async_probe(session, host))
+            self._in_flight[host] = task
+        return await asyncio.shield(task)
+
+    async def _async_probe(self, session: aiohttp.ClientSession, host: str) -> HubState:
+        client = AnthemApiClient(host, None, session)
+        self._prune()
+        try:
+            state = await client.get_running_state()
+        finally:
+            del self._in_flight[host]
+            await client.async_close()
+        self._results[host] = (time.monotonic() + self._ttl, state)
+        return state
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        for host in [host for host, (expiry, _) in self._results.items() if expiry <= now]:
+            del self._results[host]
+
+
+@callback
+def async_get_probe_cache(hass: HomeAssistant) -> AnthemProbeCache:
+    """Return the probe cache shared by all Anthem Shower config flows."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if DATA_PROBE_CACHE not in domain_data:
+        domain_data[DATA_PROBE_CACHE] = AnthemProbeCache()
+    return domain_data[DATA_PROBE_CACHE]
+
+
+async def async_scan_network(
+    session: aiohttp.ClientSession,
+    network: ipaddress.IPv4Network,
+    *,
+    concurrency: int = SCAN_CONCURRENCY,
+    timeout: float = SCAN_HOST_TIMEOUT,
+) -> AsyncIterator[str]:
+    """Probe every address in a network, yielding hubs as they answer.
+
+    Each address gets one unauthenticated get_hub_running_state request.
+    At most ``concurrency`` are in flight, and each gets ``timeout``
+    seconds, so a /24 is covered in a few seconds. Hubs are yielded as
+    soon as they reply, not in address order.
+    """
+    budget = TimeoutBudget(timeout, timeout, 1.0)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(host: str) -> str | None:
+        async with semaphore:
+            client = AnthemApiClient(host, None, session, poll_budget=budget)
+            try:
+                await client.async_test_connection()
+            except (AnthemAuthError, AnthemConnectionError):
+                return None
+            finally:
+                await client.async_close()
+        _LOGGER.debug("Found an Anthem hub at %s", host)
+        return host
+
+    tasks = [asyncio.create_task(probe(str(address))) for address in network.hosts()]
+    try:
+        for next_reply in asyncio.as_completed(tasks):
+            if (host := await next_reply) is not None:
+                yield host
+    finally:
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,165 @@
+"""Shower session history for Anthem Shower."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator
+from dataclasses import dataclass
+import math
+from typing import Any
+
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, SESSION_HISTORY_SIZE
+
+
+@dataclass(frozen=True, slots=True)
+class ShowerSession:
+    """One run of the shower, from start to stop."""
+
+    start: float  # POSIX timestamps
+    end: float
+    temperature: float | None = None
+    device_names: tuple[str, ...] = ()
+
+    @property
+    def duration(self) -> float:
+        """Return the session length in seconds."""
+        return self.end - self.start
+
+
+class SessionHistory:
+    """Bounded ring buffer of recent sessions plus lifetime totals.
+
+    Numeric fields live in preallocated ``array`` columns rather than one
+    object per session, so the buffer stays small and fixed in size. The
+    oldest session is overwritten once ``capacity`` is reached; lifetime
+    totals keep counting.
+    """
+
+    def __init__(self, capacity: int = SESSION_HISTORY_SIZE) -> None:
+        """Initialise an empty history."""
+        self.capacity = capacity
+        self._starts = array("d", bytes(8 * capacity))
+        self._ends = array("d", bytes(8 * capacity))
+        self._temperatures = array("d", bytes(8 * capacity))
+        self._device_names: list[tuple[str, ...]] = [()] * capacity
+        self._next = 0
+        self._count = 0
+        self.total_sessions = 0
+        self.total_duration = 0.0  # seconds
+
+    def __len__(self) -> int:
+        """Return how many sessions are held."""
+        return self._count
+
+    def __iter__(self) -> Iterator[ShowerSession]:
+        """Iterate over held sessions, oldest first."""
+        first = (self._next - self._count) % self.capacity
+        for offset in range(self._count):
+            yield self._session((first + offset) % self.capacity)
+
+    def _session(self, index: int) -> ShowerSession:
+        temperature = self._temperatures[index]
+        return ShowerSession(
+            start=self._starts[index],
+            end=self._ends[index],
+            temperature=None if math.isnan(temperature) else temperature,
+            device_names=self._device_names[index],
+        )
+
+    def append(self, session: ShowerSession) -> None:
+        """Add a finished session, overwriting the oldest when full."""
+        self._store(session)
+        self.total_sessions += 1
+        self.total_duration += session.duration
+
+    def _store(self, session: ShowerSession) -> None:
+        index = self._next
+        self._starts[index] = session.start
+        self._ends[index] = session.end
+        temperature = session.temperature
+        self._temperatures[index] = math.nan if temperature is None else temperature
+        self._device_names[index] = session.device_names
+        self._next = (index + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    @property
+    def last(self) -> ShowerSession | None:
+        """Return the most recent session."""
+        if not self._count:
+            return None
+        return self._session((self._next - 1) % self.capacity)
+
+    def count_since(self, timestamp: float) -> int:
+        """Return how many held sessions started at or after a time."""
+        return sum(1 for session in self if session.start >= timestamp)
+
+    @property
+    def mean_duration(self) -> float | None:
+        """Return the mean length in seconds of the held sessions."""
+        if not self._count:
+            return None
+        return sum(session.duration for session in self) / self._count
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable form for storage."""
+        return {
+            "total_sessions": self.total_sessions,
+            "total_duration": self.total_duration,
+            "sessions": [
+                [session.start, session.end, session.temperature, list(session.device_names)]
+                for session in self
+            ],
+        }
+
+    @classmethod
+    def from_dict(
+        cls, data: dict[str, Any], capacity: int = SESSION_HISTORY_SIZE
+    ) -> SessionHistory:
+        """Build a history from its stored form."""
+        history = cls(capacity)
+        for start, end, temperature, device_names in data.get("sessions", ())[-capacity:]:
+            history._store(ShowerSession(start, end, temperature, tuple(device_names)))
+        history.total_sessions = data.get("total_sessions", len(history))
+        history.total_duration = data.get("total_duration", 0.0)
+        return history
+
+
+def sessions_today(history: SessionHistory) -> int:
+    """Return how many sessions started since local midnight."""
+    return history.count_since(dt_util.start_of_local_day().timestamp())
+
+
+@callback
+def async_publish_statistics(hass: HomeAssistant, entry_id: str, history: SessionHistory) -> None:
+    """Publish lifetime session count and shower time as external statistics.
+
+    Both are cumulative sums written for the hour the last session ended,
+    so the recorder's long-term statistics carry usage history without
+    dashboards scanning raw states.
+    """
+    if "recorder" not in hass.config.components or (session := history.last) is None:
+        return
+
+    hour = dt_util.utc_from_timestamp(session.end).replace(minute=0, second=0, microsecond=0)
+    prefix = f"{DOMAIN}:{entry_id.lower()}"
+    for key, name, unit, total in (
+        ("shower_sessions", "Shower sessions", None, history.total_sessions),
+        ("shower_time", "Shower time", "min", round(history.total_duration / 60, 2)),
+    ):
+        async_add_external_statistics(
+            hass,
+            StatisticMetaData(
+                has_mean=False,
+                has_sum=True,
+                name=name,
+                source=DOMAIN,
+                statistic_id=f"{prefix}_{key}",
+                unit_of_measurement=unit,
+            ),
+            [StatisticData(start=hour, state=total, sum=total)],
+        )
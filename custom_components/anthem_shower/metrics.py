@@ -0,0 +1,141 @@
+"""Request metrics for the Anthem Shower API client."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+import time
+
+from .const import METRICS_SAMPLE_SIZE
+
+ENDPOINTS = ("request_user_login", "get_hub_running_state", "req_update_command")
+
+
+class EndpointMetrics:
+    """Latency samples and outcome counters for one hub endpoint.
+
+    Latencies are kept in a fixed-size ring buffer so memory use and the
+    cost of computing percentiles stay constant however long HA runs.
+    Round trips of successful requests are also kept on their own, as
+    the basis for adaptive timeouts.
+    """
+
+    __slots__ = (
+        "_latencies",
+        "_sorted",
+        "_round_trips",
+        "_sorted_round_trips",
+        "success",
+        "error",
+        "timeout",
+        "timeout_streak",
+    )
+
+    def __init__(self, size: int = METRICS_SAMPLE_SIZE) -> None:
+        """Initialise empty metrics."""
+        self._latencies: deque[float] = deque(maxlen=size)
+        self._sorted: list[float] | None = None
+        self._round_trips: deque[float] = deque(maxlen=size)
+        self._sorted_round_trips: list[float] | None = None
+        self.success = 0
+        self.error = 0
+        self.timeout = 0
+        self.timeout_streak = 0
+
+    def record(self, latency: float, outcome: str) -> None:
+        """Record one request."""
+        self._latencies.append(latency)
+        self._sorted = None
+        setattr(self, outcome, getattr(self, outcome) + 1)
+        if outcome == "success":
+            self._round_trips.append(latency)
+            self._sorted_round_trips = None
+            self.timeout_streak = 0
+        elif outcome == "timeout":
+            self.timeout_streak += 1
+
+    def percentile(self, pct: float) -> float | None:
+        """Return a latency percentile in seconds over recent requests."""
+        if not self._latencies:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._latencies)
+        return _pick(self._sorted, pct)
+
+    @property
+    def round_trip_samples(self) -> int:
+        """Return how many successful round trips are sampled."""
+        return len(self._round_trips)
+
+    def round_trip(self, pct: float) -> float | None:
+        """Return a round-trip percentile in seconds over recent successes."""
+        if not self._round_trips:
+            return None
+        if self._sorted_round_trips is None:
+            self._sorted_round_trips = sorted(self._round_trips)
+        return _pick(self._sorted_round_trips, pct)
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """Return a summary for diagnostics."""
+        return {
+            "success": self.success,
+            "error": self.error,
+            "timeout": self.timeout,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+def _pick(ordered: list[float], pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+class ClientMetrics:
+    """Metrics for every endpoint of one hub, plus login statistics."""
+
+    def __init__(self) -> None:
+        """Initialise empty metrics."""
+        self.endpoints = {endpoint: EndpointMetrics() for endpoint in ENDPOINTS}
+        self.logins = 0
+        self.token_obtained: float | None = None
+
+    @contextmanager
+    def measure(self, endpoint: str) -> Iterator[None]:
+        """Time a request and count its outcome.
+
+        Any exception counts as an error, or as a timeout when it was
+        caused by one.
+        """
+        start = time.monotonic()
+        outcome = "error"
+        try:
+            yield
+            outcome = "success"
+        except Exception as err:
+            if isinstance(err, TimeoutError) or isinstance(err.__cause__, TimeoutError):
+                outcome = "timeout"
+            raise
+        finally:
+            self.endpoints[endpoint].record(time.monotonic() - start, outcome)
+
+    def record_login(self) -> None:
+        """Count a successful login."""
+        self.logins += 1
+        self.token_obtained = time.time()
+
+    @property
+    def token_age(self) -> float | None:
+        """Return seconds since the current token was obtained."""
+        if self.token_obtained is None:
+            return None
+        return time.time() - self.token_obtained
+
+    def as_dict(self) -> dict:
+        """Return a summary for diagnostics."""
+        return {
+            "logins": self.logins,
+            "token_age": self.token_age,
+            "endpoints": {name: metrics.as_dict() for name, metrics in self.endpoints.items()},
+        }
@@ -0,0 +1,137 @@
+"""Data models for Anthem Shower."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import math
+import re
+from typing import Any
+
+_ZONE_KEY = re.compile(r"zone(\d+)$")
+
+# Reply fields that are parsed into dedicated attributes or are plumbing
+_KNOWN_KEYS = {"running", "devicename", "status", "error", "errorCode", "error_code", "req_command"}
+
+
+@dataclass(frozen=True, slots=True)
+class ZoneState:
+    """State of one zone as reported by the hub."""
+
+    number: int
+    temperature: float | None = None
+    flow_rate: float | None = None
+    outlets: tuple[int, ...] = ()
+
+    @classmethod
+    def from_dict(cls, number: int, data: dict[str, Any]) -> ZoneState:
+        """Build a zone from a hub ``zoneN`` object."""
+        return cls(
+            number=number,
+            temperature=_number(data.get("temperature")),
+            flow_rate=_number(data.get("flowRate")),
+            outlets=_outlets(data.get("outletState")),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the hub's ``zoneN`` form."""
+        return {
+            "temperature": self.temperature,
+            "flowRate": self.flow_rate,
+            "outletState": list(self.outlets),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class HubState:
+    """State reported by one poll of the hub.
+
+    Instances are immutable and compare by value, so the coordinator can
+    skip notifying entities when a poll reports nothing new. Scalar fields
+    the integration doesn't model yet are kept in ``extra``.
+    """
+
+    running: bool = False
+    device_names: tuple[str, ...] = ()
+    zones: tuple[ZoneState, ...] = ()
+    error_code: str | None = None
+    extra: tuple[tuple[str, str | int | float | bool], ...] = ()
+
+    @classmethod
+    def from_response(cls, data: dict[str, Any]) -> HubState:
+        """Build a state from everything in a hub reply."""
+        zones: list[ZoneState] = []
+        extra: list[tuple[str, str | int | float | bool]] = []
+        for key, value in data.items():
+            if (match := _ZONE_KEY.match(key)) and isinstance(value, dict):
+                zones.append(ZoneState.from_dict(int(match.group(1)), value))
+            elif key not in _KNOWN_KEYS and isinstance(value, str | int | float | bool):
+                extra.append((key, value))
+        error_code = data.get("errorCode", data.get("error_code"))
+        return cls(
+            running=data.get("running") is True,
+            device_names=_names(data.get("devicename")),
+            zones=tuple(sorted(zones, key=lambda zone: zone.number)),
+            error_code=None if error_code in (None, "", 0, "0") else str(error_code),
+            extra=tuple(sorted(extra)),
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> HubState:
+        """Build a state from its stored form."""
+        return cls(
+            running=data.get("running") is True,
+            device_names=tuple(data.get("device_names", ())),
+            zones=tuple(
+                ZoneState.from_dict(int(number), zone)
+                for number, zone in data.get("zones", {}).items()
+            ),
+            error_code=data.get("error_code"),
+            extra=tuple((key, value) for key, value in data.get("extra", {}).items()),
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON-serialisable form for storage and diagnostics."""
+        return {
+            "running": self.running,
+            "device_names": list(self.device_names),
+            "zones": {str(zone.number): zone.as_dict() for zone in self.zones},
+            "error_code": self.error_code,
+            "extra": dict(self.extra),
+        }
+
+    def zone(self, number: int) -> ZoneState | None:
+        """Return a zone by number, if the hub reported it."""
+        return next((zone for zone in self.zones if zone.number == number), None)
+
+
+def _number(value: Any) -> float | None:
+    try:
+        return None if value is None else float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _names(value: Any) -> tuple[str, ...]:
+    """Parse ``devicename``, which may be missing, null or a single name."""
+    if value is None:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    if isinstance(value, list | tuple):
+        return tuple(str(name) for name in value)
+    return (str(value),)
+
+
+def _outlets(value: Any) -> tuple[int, ...]:
+    """Parse ``outletState``, reading entries that aren't numbers as off.
+
+    Outlets are identified by position, so bad entries are kept as 0
+    rather than dropped.
+    """
+    if not isinstance(value, list | tuple):
+        return ()
+    outlets = []
+    for state in value:
+        number = _number(state)
+        outlets.append(int(number) if number is not None and math.isfinite(number) else 0)
+    return tuple(outlets)
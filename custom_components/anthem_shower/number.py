@@ -4,13 +4,13 @@ from __future__ import annotations
 
 from homeassistant.components.number import NumberEntity, NumberMode
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import PERCENTAGE, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_HOST, DOMAIN
+from .const import CONF_HOST, DEFAULT_FLOW_RATE, DOMAIN
 from .coordinator import AnthemCoordinator
 
 
@@ -19,16 +19,19 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up the Anthem Shower target temperature number."""
+    """Set up the Anthem Shower target temperature and flow rate numbers."""
     coordinator: AnthemCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([AnthemTargetTemperature(coordinator, entry)])
+    entities: list[NumberEntity] = []
+    for zone in coordinator.zone_numbers:
+        entities.append(AnthemTargetTemperature(coordinator, entry, zone))
+        entities.append(AnthemFlowRate(coordinator, entry, zone))
+    async_add_entities(entities)
 
 
 class AnthemTargetTemperature(CoordinatorEntity[AnthemCoordinator], NumberEntity):
-    """Number entity for shower target temperature."""
+    """Number entity for a zone's target temperature."""
 
     _attr_has_entity_name = True
-    _attr_name = "Target Temperature"
     _attr_icon = "mdi:thermometer"
     _attr_native_min_value = 60.0
     _attr_native_max_value = 120.0
@@ -36,11 +39,16 @@ class AnthemTargetTemperature(CoordinatorEntity[AnthemCoordinator], NumberEntity
     _attr_native_unit_of_measurement = UnitOfTemperature.FAHRENHEIT
     _attr_mode = NumberMode.SLIDER
 
-    def __init__(self, coordinator: AnthemCoordinator, entry: ConfigEntry) -> None:
+    def __init__(self, coordinator: AnthemCoordinator, entry: ConfigEntry, zone: int = 1) -> None:
         """Initialise the number entity."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{entry.entry_id}_target_temperature"
-        self._attr_native_value = coordinator.target_temperature
+        self._zone = zone
+        if zone == 1:
+            self._attr_name = "Target Temperature"
+            self._attr_unique_id = f"{entry.entry_id}_target_temperature"
+        else:
+            self._attr_name = f"Zone {zone} Target Temperature"
+            self._attr_unique_id = f"{entry.entry_id}_zone{zone}_target_temperature"
         host = entry.data[CONF_HOST]
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, entry.entry_id)},
@@ -51,11 +59,56 @@ class AnthemTargetTemperature(CoordinatorEntity[AnthemCoordinator], NumberEntity
         )
 
     @property
-    def native_value(self) -> float:
+    def native_value(self) -> float | None:
         """Return the current target temperature."""
-        return self.coordinator.target_temperature
+        if self._zone == 1:
+            return self.coordinator.target_temperature
+        if (zone := self.coordinator.zone_settings.get(self._zone)) is None:
+            return None
+        return zone.temperature
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Set the target temperature, updating a running shower."""
+        self.coordinator.async_update_zone(self._zone, temperature=value)
+        self.coordinator.async_schedule_live_update()
+        self.async_write_ha_state()
+
+
+class AnthemFlowRate(CoordinatorEntity[AnthemCoordinator], NumberEntity):
+    """Number entity for a zone's flow rate."""
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:water-percent"
+    _attr_native_min_value = 0.0
+    _attr_native_max_value = 100.0
+    _attr_native_step = 1.0
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_mode = NumberMode.SLIDER
+
+    def __init__(self, coordinator: AnthemCoordinator, entry: ConfigEntry, zone: int) -> None:
+        """Initialise the number entity."""
+        super().__init__(coordinator)
+        self._zone = zone
+        self._attr_name = f"Zone {zone} Flow Rate"
+        self._attr_unique_id = f"{entry.entry_id}_zone{zone}_flow_rate"
+        host = entry.data[CONF_HOST]
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, entry.entry_id)},
+            name="Anthem Shower Hub",
+            manufacturer="Anthem",
+            model="Shower Hub",
+            configuration_url=f"http://{host}",
+        )
+
+    @property
+    def native_value(self) -> float:
+        """Return the flow rate used when the zone starts."""
+        if (zone := self.coordinator.zone_settings.get(self._zone)) is None or zone.flow_rate is None:
+            return DEFAULT_FLOW_RATE
+        return zone.flow_rate
 
     async def async_set_native_value(self, value: float) -> None:
-        """Set the target temperature."""
-        self.coordinator.target_temperature = value
+        """Set the flow rate, updating a running shower."""
+        self.coordinator.async_update_zone(self._zone, flow_rate=value)
+        self.coordinator.async_schedule_live_update()
         self.async_write_ha_state()
@@ -0,0 +1,144 @@
+"""Prioritised request queue for a single Anthem hub."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import AbstractAsyncContextManager, nullcontext
+from enum import IntEnum
+from functools import partial
+import itertools
+import logging
+from typing import Any
+
+from .api import AnthemApiClient
+from .models import HubState, ZoneState
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """Order in which queued hub requests are sent (lowest first)."""
+
+    COMMAND = 0
+    POLL = 1
+
+
+class StalePollError(Exception):
+    """A poll was superseded by a command queued while it was in flight."""
+
+
+class CommandSupersededError(Exception):
+    """A command was dropped unsent because a newer one was queued."""
+
+
+class AnthemRequestQueue:
+    """Serialise all traffic to one hub, commands ahead of polls.
+
+    Only one request is in flight per hub. Commands go out in the order
+    they were queued, ahead of any polls. Each command sets the whole
+    shower state, so a new command supersedes any still waiting, which
+    fail with CommandSupersededError: the latest command always wins.
+    Polls that are still waiting in the queue are merged into one, and a
+    poll that was already in flight when a command was queued fails with
+    StalePollError instead of reporting the pre-command state.
+    """
+
+    def __init__(
+        self,
+        client: AnthemApiClient,
+        poll_slot: Callable[[], AbstractAsyncContextManager[Any]] = nullcontext,
+    ) -> None:
+        """Initialise the queue.
+
+        poll_slot is entered around each poll, letting a domain-wide
+        scheduler cap polls in flight across hubs. A poll takes its slot
+        before it is queued, so the worker never waits for one and
+        commands bypass it.
+        """
+        self._client = client
+        self._poll_slot = poll_slot
+        self._queue: asyncio.PriorityQueue[
+            tuple[int, int, Callable[[], Awaitable[Any]], asyncio.Future[Any]]
+        ] = asyncio.PriorityQueue()
+        self._seq = itertools.count()
+        self._worker: asyncio.Task[None] | None = None
+        self._pending_poll: asyncio.Task[HubState] | None = None
+        self._waiting_command: asyncio.Future[Any] | None = None
+        self._command_epoch = 0
+
+    def _submit(
+        self, priority: RequestPriority, func: Callable[[], Awaitable[Any]]
+    ) -> asyncio.Future[Any]:
+        future: asyncio.Future[Any] = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((priority, next(self._seq), func, future))
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+        return future
+
+    async def _run(self) -> None:
+        while True:
+            priority, _, func, future = await self._queue.get()
+            if future.done():
+                # Caller gave up while the request was queued
+                continue
+            is_poll = priority == RequestPriority.POLL
+            if is_poll:
+                self._pending_poll = None
+            else:
+                self._waiting_command = None
+            epoch = self._command_epoch
+            try:
+                result = await func()
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as err:
+                if not future.done():
+                    future.set_exception(err)
+                continue
+            if future.done():
+                continue
+            if is_poll and epoch != self._command_epoch:
+                _LOGGER.debug("Dropping poll result superseded by a command")
+                future.set_exception(StalePollError())
+            else:
+                future.set_result(result)
+
+    async def async_poll(self) -> HubState:
+        """Queue a state poll, joining one that is already waiting."""
+        if self._pending_poll is None or self._pending_poll.done():
+            self._pending_poll = asyncio.create_task(self._async_poll_in_slot())
+        return await asyncio.shield(self._pending_poll)
+
+    async def _async_poll_in_slot(self) -> HubState:
+        async with self._poll_slot():
+            return await self._submit(RequestPriority.POLL, self._client.get_running_state)
+
+    async def _async_command(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        self._command_epoch += 1
+        if (waiting := self._waiting_command) is not None and not waiting.done():
+            waiting.set_exception(CommandSupersededError())
+        self._waiting_command = self._submit(RequestPriority.COMMAND, func)
+        return await self._waiting_command
+
+    async def async_start_zones(self, zones: Iterable[ZoneState]) -> HubState | None:
+        """Queue a multi-zone start command ahead of any polls."""
+        return await self._async_command(partial(self._client.start_zones, tuple(zones)))
+
+    async def async_stop_water_test(self) -> HubState | None:
+        """Queue a stop command ahead of any polls."""
+        return await self._async_command(self._client.stop_water_test)
+
+    async def async_close(self) -> None:
+        """Stop the worker and fail anything still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        if self._pending_poll is not None:
+            self._pending_poll.cancel()
+            self._pending_poll = None
+        while not self._queue.empty():
+            *_, future = self._queue.get_nowait()
+            if not future.done():
+                future.cancel()
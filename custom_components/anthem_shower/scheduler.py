@@ -0,0 +1,79 @@
+"""Domain-wide poll scheduling for Anthem Shower hubs."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import random
+import time
+
+from .const import (
+    FLEET_JITTER,
+    FLEET_MAX_CONCURRENT_POLLS,
+    FLEET_PHASE_SPACING,
+    FLEET_THROUGHPUT_WINDOW,
+)
+
+
+class AnthemPollScheduler:
+    """Pace polls across every configured hub.
+
+    Hubs are given staggered start phases so they don't all poll together
+    after a restart, poll intervals are jittered so they don't drift back
+    into lockstep, and the number of polls in flight across the whole
+    domain is capped.
+    """
+
+    def __init__(self, max_concurrent: int = FLEET_MAX_CONCURRENT_POLLS) -> None:
+        """Initialise the scheduler."""
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._hubs: set[str] = set()
+        self._completed: deque[float] = deque()
+        self.in_flight = 0
+
+    def register(self, entry_id: str) -> float:
+        """Register a hub and return the delay before its first poll."""
+        slot = len(self._hubs)
+        self._hubs.add(entry_id)
+        return slot * FLEET_PHASE_SPACING + random.uniform(0, FLEET_PHASE_SPACING)
+
+    def unregister(self, entry_id: str) -> None:
+        """Forget a hub."""
+        self._hubs.discard(entry_id)
+
+    @property
+    def hub_count(self) -> int:
+        """Return the number of registered hubs."""
+        return len(self._hubs)
+
+    @staticmethod
+    def jitter(seconds: float) -> float:
+        """Spread an interval by a few percent either way."""
+        return seconds * random.uniform(1 - FLEET_JITTER, 1 + FLEET_JITTER)
+
+    @asynccontextmanager
+    async def poll_slot(self) -> AsyncIterator[None]:
+        """Hold one of the domain's concurrent poll slots."""
+        async with self._semaphore:
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+                now = time.monotonic()
+                self._completed.append(now)
+                self._trim(now)
+
+    def _trim(self, now: float) -> None:
+        """Forget completions older than the throughput window."""
+        cutoff = now - FLEET_THROUGHPUT_WINDOW
+        while self._completed and self._completed[0] < cutoff:
+            self._completed.popleft()
+
+    @property
+    def throughput(self) -> float:
+        """Return completed polls per minute across all hubs."""
+        self._trim(time.monotonic())
+        return len(self._completed) * 60 / FLEET_THROUGHPUT_WINDOW
@@ -0,0 +1,372 @@
+"""Sensor platform for Anthem Shower."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
+
+from .circuit_breaker import BreakerState
+from .const import CONF_HOST, DOMAIN
+from .coordinator import AnthemCoordinator
+from .history import SessionHistory, sessions_today
+from .metrics import ClientMetrics
+from .models import ZoneState
+
+# Metrics change with every request, and "today" rolls over at midnight,
+# so the diagnostic and history sensors are polled rather than
+# coordinator driven
+SCAN_INTERVAL = timedelta(seconds=30)
+
+ENDPOINT_NAMES = {
+    "request_user_login": "Login",
+    "get_hub_running_state": "Poll",
+    "req_update_command": "Command",
+}
+
+
+@dataclass(frozen=True, kw_only=True)
+class AnthemSensorEntityDescription(SensorEntityDescription):
+    """Describes an Anthem Shower sensor."""
+
+    value_fn: Callable[[AnthemCoordinator], float | int | str | None]
+
+
+def _latency(endpoint: str, pct: float) -> Callable[[AnthemCoordinator], float | None]:
+    def value(coordinator: AnthemCoordinator) -> float | None:
+        seconds = coordinator.client.metrics.endpoints[endpoint].percentile(pct)
+        return None if seconds is None else round(seconds * 1000, 1)
+
+    return value
+
+
+def _count(endpoint: str, outcome: str) -> Callable[[AnthemCoordinator], int]:
+    return lambda coordinator: getattr(coordinator.client.metrics.endpoints[endpoint], outcome)
+
+
+def _metrics(coordinator: AnthemCoordinator) -> ClientMetrics:
+    return coordinator.client.metrics
+
+
+def _diagnostic_descriptions() -> list[AnthemSensorEntityDescription]:
+    descriptions = [
+        AnthemSensorEntityDescription(
+            key="circuit_breaker",
+            name="Circuit breaker",
+            icon="mdi:electric-switch",
+            device_class=SensorDeviceClass.ENUM,
+            options=[state.value for state in BreakerState],
+            value_fn=lambda coordinator: coordinator.client.breaker.state,
+        ),
+        AnthemSensorEntityDescription(
+            key="login_count",
+            name="Login count",
+            icon="mdi:login",
+            state_class=SensorStateClass.TOTAL_INCREASING,
+            value_fn=lambda coordinator: _metrics(coordinator).logins,
+        ),
+        AnthemSensorEntityDescription(
+            key="token_age",
+            name="Token age",
+            icon="mdi:key-chain",
+            device_class=SensorDeviceClass.DURATION,
+            native_unit_of_measurement=UnitOfTime.SECONDS,
+            value_fn=lambda coordinator: (
+                None if (age := _metrics(coordinator).token_age) is None else round(age)
+            ),
+        ),
+    ]
+    for endpoint, label in ENDPOINT_NAMES.items():
+        for pct in (50, 95):
+            descriptions.append(
+                AnthemSensorEntityDescription(
+                    key=f"{endpoint}_latency_p{pct}",
+                    name=f"{label} latency p{pct}",
+                    icon="mdi:timer-outline",
+                    device_class=SensorDeviceClass.DURATION,
+                    native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+                    state_class=SensorStateClass.MEASUREMENT,
+                    value_fn=_latency(endpoint, pct),
+                )
+            )
+        for outcome in ("success", "error", "timeout"):
+            descriptions.append(
+                AnthemSensorEntityDescription(
+                    key=f"{endpoint}_{outcome}_count",
+                    name=f"{label} {outcome} count",
+                    icon="mdi:counter",
+                    state_class=SensorStateClass.TOTAL_INCREASING,
+                    value_fn=_count(endpoint, outcome),
+                )
+            )
+    return descriptions
+
+
+DIAGNOSTIC_SENSORS = _diagnostic_descriptions()
+
+
+@dataclass(frozen=True, kw_only=True)
+class AnthemHistorySensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor fed from the shower session history."""
+
+    value_fn: Callable[[SessionHistory], float | int | datetime | None]
+    attributes_fn: Callable[[SessionHistory], dict[str, Any] | None] = lambda history: None
+
+
+def _minutes(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds / 60, 1)
+
+
+def _last_session_attributes(history: SessionHistory) -> dict[str, Any] | None:
+    if (session := history.last) is None:
+        return None
+    return {
+        "end": dt_util.utc_from_timestamp(session.end).isoformat(),
+        "target_temperature": session.temperature,
+        "devices": list(session.device_names),
+    }
+
+
+HISTORY_SENSORS = (
+    AnthemHistorySensorEntityDescription(
+        key="sessions_today",
+        name="Sessions today",
+        icon="mdi:shower",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=sessions_today,
+    ),
+    AnthemHistorySensorEntityDescription(
+        key="mean_session_duration",
+        name="Mean session duration",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda history: _minutes(history.mean_duration),
+    ),
+    AnthemHistorySensorEntityDescription(
+        key="total_session_duration",
+        name="Total shower time",
+        icon="mdi:timer-sand",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda history: _minutes(history.total_duration),
+    ),
+    AnthemHistorySensorEntityDescription(
+        key="last_session_start",
+        name="Last session",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda history: (
+            None
+            if (session := history.last) is None
+            else dt_util.utc_from_timestamp(session.start)
+        ),
+        attributes_fn=_last_session_attributes,
+    ),
+    AnthemHistorySensorEntityDescription(
+        key="last_session_duration",
+        name="Last session duration",
+        icon="mdi:timer-outline",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        value_fn=lambda history: (
+            None if (session := history.last) is None else _minutes(session.duration)
+        ),
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class AnthemZoneSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor fed from one zone of the hub state."""
+
+    value_fn: Callable[[ZoneState], float | None]
+
+
+ZONE_SENSORS = (
+    AnthemZoneSensorEntityDescription(
+        key="temperature",
+        name="temperature",
+        device_class=SensorDeviceClass.TEMPERATURE,
+        native_unit_of_measurement=UnitOfTemperature.FAHRENHEIT,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda zone: zone.temperature,
+    ),
+    AnthemZoneSensorEntityDescription(
+        key="flow_rate",
+        name="flow rate",
+        icon="mdi:water-percent",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda zone: zone.flow_rate,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the Anthem Shower sensors."""
+    coordinator: AnthemCoordinator = hass.data[DOMAIN][entry.entry_id]
+    entities: list[SensorEntity] = [
+        AnthemDiagnosticSensor(coordinator, entry, description)
+        for description in DIAGNOSTIC_SENSORS
+    ]
+    entities.append(AnthemErrorCodeSensor(coordinator, entry))
+    entities.extend(
+        AnthemHistorySensor(coordinator, entry, description) for description in HISTORY_SENSORS
+    )
+    # Zones are only known once the hub has reported them
+    if coordinator.data is not None:
+        entities.extend(
+            AnthemZoneSensor(coordinator, entry, zone.number, description)
+            for zone in coordinator.data.zones
+            for description in ZONE_SENSORS
+        )
+    async_add_entities(entities)
+
+
+def _device_info(entry: ConfigEntry) -> DeviceInfo:
+    host = entry.data[CONF_HOST]
+    return DeviceInfo(
+        identifiers={(DOMAIN, entry.entry_id)},
+        name="Anthem Shower Hub",
+        manufacturer="Anthem",
+        model="Shower Hub",
+        configuration_url=f"http://{host}",
+    )
+
+
+class AnthemZoneSensor(CoordinatorEntity[AnthemCoordinator], SensorEntity):
+    """Sensor reporting a value the hub reports for one zone."""
+
+    entity_description: AnthemZoneSensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: AnthemCoordinator,
+        entry: ConfigEntry,
+        zone: int,
+        description: AnthemZoneSensorEntityDescription,
+    ) -> None:
+        """Initialise the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._zone = zone
+        self._attr_name = f"Zone {zone} {description.name}"
+        self._attr_unique_id = f"{entry.entry_id}_zone{zone}_{description.key}"
+        self._attr_device_info = _device_info(entry)
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the zone value."""
+        if self.coordinator.data is None:
+            return None
+        if (zone := self.coordinator.data.zone(self._zone)) is None:
+            return None
+        return self.entity_description.value_fn(zone)
+
+    @property
+    def extra_state_attributes(self) -> dict | None:
+        """Return the zone's outlet states."""
+        if self.coordinator.data is None:
+            return None
+        if (zone := self.coordinator.data.zone(self._zone)) is None or not zone.outlets:
+            return None
+        return {"outlets": list(zone.outlets)}
+
+
+class AnthemErrorCodeSensor(CoordinatorEntity[AnthemCoordinator], SensorEntity):
+    """Sensor reporting the error code the hub last reported."""
+
+    _attr_has_entity_name = True
+    _attr_name = "Error code"
+    _attr_icon = "mdi:alert-circle-outline"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, coordinator: AnthemCoordinator, entry: ConfigEntry) -> None:
+        """Initialise the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = f"{entry.entry_id}_error_code"
+        self._attr_device_info = _device_info(entry)
+
+    @property
+    def native_value(self) -> str | None:
+        """Return the error code, or None when the hub reports no error."""
+        if self.coordinator.data is None:
+            return None
+        return self.coordinator.data.error_code
+
+
+class AnthemDiagnosticSensor(SensorEntity):
+    """Diagnostic sensor reporting how the hub's API is performing."""
+
+    entity_description: AnthemSensorEntityDescription
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: AnthemCoordinator,
+        entry: ConfigEntry,
+        description: AnthemSensorEntityDescription,
+    ) -> None:
+        """Initialise the sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = _device_info(entry)
+
+    @property
+    def native_value(self) -> float | int | str | None:
+        """Return the current metric value."""
+        return self.entity_description.value_fn(self.coordinator)
+
+
+class AnthemHistorySensor(SensorEntity):
+    """Sensor summarising recorded shower sessions."""
+
+    entity_description: AnthemHistorySensorEntityDescription
+    _attr_has_entity_name = True
+
+    def __init__(
+        self,
+        coordinator: AnthemCoordinator,
+        entry: ConfigEntry,
+        description: AnthemHistorySensorEntityDescription,
+    ) -> None:
+        """Initialise the sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_unique_id = f"{entry.entry_id}_{description.key}"
+        self._attr_device_info = _device_info(entry)
+
+    @property
+    def native_value(self) -> float | int | datetime | None:
+        """Return the current value."""
+        return self.entity_description.value_fn(self.coordinator.history)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return details of the value, if any."""
+        return self.entity_description.attributes_fn(self.coordinator.history)
@@ -0,0 +1,200 @@
+"""Domain services for Anthem Shower."""
+
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+import logging
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .api import AnthemAuthError, AnthemConnectionError
+from .const import (
+    ACTION_START,
+    ACTION_STOP,
+    ATTR_ACTION,
+    ATTR_FLOW_RATE,
+    ATTR_OUTLETS,
+    ATTR_START,
+    ATTR_TEMPERATURE,
+    ATTR_ZONE,
+    ATTR_ZONES,
+    DEFAULT_FLOW_RATE,
+    DEFAULT_OUTLET_STATE,
+    DEFAULT_TARGET_TEMPERATURE,
+    DOMAIN,
+    GROUP_MAX_CONCURRENT,
+    OUTLET_COUNT,
+    SERVICE_APPLY_PRESET,
+    SERVICE_GROUP_CONTROL,
+)
+from .coordinator import AnthemCoordinator
+from .models import ZoneState
+
+_LOGGER = logging.getLogger(__name__)
+
+GROUP_CONTROL_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ACTION): vol.In([ACTION_START, ACTION_STOP]),
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+ZONE_PRESET_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ZONE): vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(ATTR_TEMPERATURE, default=DEFAULT_TARGET_TEMPERATURE): vol.All(
+            vol.Coerce(float), vol.Range(min=60, max=120)
+        ),
+        vol.Optional(ATTR_FLOW_RATE, default=DEFAULT_FLOW_RATE): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=100)
+        ),
+        vol.Optional(ATTR_OUTLETS, default=list(DEFAULT_OUTLET_STATE)): vol.All(
+            cv.ensure_list,
+            [vol.All(vol.Coerce(int), vol.In([0, 1]))],
+            vol.Length(min=1, max=OUTLET_COUNT),
+        ),
+    }
+)
+
+APPLY_PRESET_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Required(ATTR_ZONES): vol.All(cv.ensure_list, [ZONE_PRESET_SCHEMA]),
+        vol.Optional(ATTR_START, default=True): cv.boolean,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the domain services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_PRESET,
+        partial(_async_apply_preset, hass),
+        schema=APPLY_PRESET_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GROUP_CONTROL,
+        partial(_async_group_control, hass),
+        schema=GROUP_CONTROL_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def _async_target_hubs(
+    hass: HomeAssistant, device_ids: list[str] | None
+) -> list[tuple[ConfigEntry, AnthemCoordinator]]:
+    """Return the loaded hubs a call targets, all of them by default."""
+    entries = [
+        entry
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+    if device_ids is not None:
+        device_registry = dr.async_get(hass)
+        entry_ids = {
+            entry_id
+            for device_id in device_ids
+            if (device := device_registry.async_get(device_id)) is not None
+            for entry_id in device.config_entries
+        }
+        entries = [entry for entry in entries if entry.entry_id in entry_ids]
+    return [(entry, hass.data[DOMAIN][entry.entry_id]) for entry in entries]
+
+
+async def _async_apply_preset(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Apply settings for every zone of each hub in a single command per hub."""
+    hubs = _async_target_hubs(hass, call.data[ATTR_DEVICE_ID])
+    if not hubs:
+        raise ServiceValidationError("No loaded Anthem hubs match the call")
+    zones = tuple(
+        ZoneState(
+            number=zone[ATTR_ZONE],
+            temperature=zone[ATTR_TEMPERATURE],
+            flow_rate=zone[ATTR_FLOW_RATE],
+            outlets=tuple(zone[ATTR_OUTLETS]) + (0,) * (OUTLET_COUNT - len(zone[ATTR_OUTLETS])),
+        )
+        for zone in call.data[ATTR_ZONES]
+    )
+    await asyncio.gather(
+        *(
+            coordinator.async_apply_preset(zones, start=call.data[ATTR_START])
+            for _, coordinator in hubs
+        )
+    )
+
+
+async def _async_group_control(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Start or stop several hubs at once.
+
+    Commands go out concurrently, at most GROUP_MAX_CONCURRENT at a time,
+    without each hub's own confirmation polls. Hubs whose reply didn't
+    already report the new state are then refreshed together.
+    """
+    hubs = _async_target_hubs(hass, call.data.get(ATTR_DEVICE_ID))
+    if not hubs:
+        raise ServiceValidationError("No loaded Anthem hubs match the call")
+    start = call.data[ATTR_ACTION] == ACTION_START
+    semaphore = asyncio.Semaphore(GROUP_MAX_CONCURRENT)
+
+    async def command(entry: ConfigEntry, coordinator: AnthemCoordinator) -> dict[str, Any]:
+        async with semaphore:
+            began = time.monotonic()
+            try:
+                if start:
+                    confirmed = await coordinator.async_start_shower(confirm=False)
+                else:
+                    confirmed = await coordinator.async_stop_shower(confirm=False)
+            except (AnthemAuthError, AnthemConnectionError, HomeAssistantError) as err:
+                return {
+                    "name": entry.title,
+                    "success": False,
+                    "error": str(err),
+                    "latency": round(time.monotonic() - began, 3),
+                }
+        return {
+            "name": entry.title,
+            "success": True,
+            "confirmed": confirmed,
+            "latency": round(time.monotonic() - began, 3),
+        }
+
+    results = await asyncio.gather(*(command(entry, coordinator) for entry, coordinator in hubs))
+    await asyncio.gather(
+        *(
+            coordinator.async_refresh()
+            for (_, coordinator), result in zip(hubs, results, strict=True)
+            if result["success"] and not result["confirmed"]
+        )
+    )
+
+    response: dict[str, Any] = {}
+    for (entry, coordinator), result in zip(hubs, results, strict=True):
+        result["running"] = coordinator.data.running if coordinator.data else None
+        response[entry.entry_id] = result
+    failed = [result["name"] for result in results if not result["success"]]
+    if failed:
+        _LOGGER.warning("Anthem group %s failed for %s", call.data[ATTR_ACTION], ", ".join(failed))
+        if not call.return_response:
+            raise HomeAssistantError(
+                f"Could not {call.data[ATTR_ACTION]} {', '.join(failed)}"
+            )
+    return {"hubs": response} if call.return_response else None
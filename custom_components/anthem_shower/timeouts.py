@@ -0,0 +1,55 @@
+"""Latency-aware request timeouts for the Anthem Shower API client."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import aiohttp
+
+from .const import (
+    COMMAND_TIMEOUT_FACTOR,
+    COMMAND_TIMEOUT_MAX,
+    COMMAND_TIMEOUT_MIN,
+    POLL_TIMEOUT_FACTOR,
+    POLL_TIMEOUT_MAX,
+    POLL_TIMEOUT_MIN,
+    TIMEOUT_MIN_SAMPLES,
+)
+from .metrics import EndpointMetrics
+
+
+@dataclass(frozen=True, slots=True)
+class TimeoutBudget:
+    """Limits for the timeouts of one kind of request.
+
+    Timeouts are ``factor`` times the observed round trip: the p95 for
+    connecting and the p99 for waiting on the reply. Both are clamped to
+    ``minimum``..``maximum``, and ``maximum`` also caps the whole
+    request. Each consecutive timeout doubles them, so a hub that has
+    become slower is given room instead of failing forever. Until enough
+    round trips are sampled the maximum is used.
+    """
+
+    minimum: float
+    maximum: float
+    factor: float
+
+    def timeout(self, metrics: EndpointMetrics) -> aiohttp.ClientTimeout:
+        """Return the timeout for the next request to an endpoint."""
+        if metrics.round_trip_samples < TIMEOUT_MIN_SAMPLES:
+            return aiohttp.ClientTimeout(total=self.maximum)
+        backoff = 2**metrics.timeout_streak
+        connect = min(self.maximum, self._clamp(metrics.round_trip(95) * self.factor) * backoff)
+        read = min(self.maximum, self._clamp(metrics.round_trip(99) * self.factor) * backoff)
+        return aiohttp.ClientTimeout(
+            total=min(self.maximum, connect + read), sock_connect=connect, sock_read=read
+        )
+
+    def _clamp(self, seconds: float) -> float:
+        return min(self.maximum, max(self.minimum, seconds))
+
+
+POLL_TIMEOUT_BUDGET = TimeoutBudget(POLL_TIMEOUT_MIN, POLL_TIMEOUT_MAX, POLL_TIMEOUT_FACTOR)
+COMMAND_TIMEOUT_BUDGET = TimeoutBudget(
+    COMMAND_TIMEOUT_MIN, COMMAND_TIMEOUT_MAX, COMMAND_TIMEOUT_FACTOR
+)
@@ -11,7 +11,7 @@ from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import CONF_HOST, DOMAIN
+from .const import CONF_HOST, DOMAIN, OUTLET_COUNT
 from .coordinator import AnthemCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,24 +22,27 @@ async def async_setup_entry(
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
-    """Set up the Anthem Shower valve."""
+    """Set up the Anthem Shower valves."""
     coordinator: AnthemCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([AnthemShowerValve(coordinator, entry)])
+    entities: list[AnthemValveBase] = [AnthemShowerValve(coordinator, entry)]
+    entities.extend(
+        AnthemOutletValve(coordinator, entry, zone, outlet)
+        for zone in coordinator.zone_numbers
+        for outlet in range(1, OUTLET_COUNT + 1)
+    )
+    async_add_entities(entities)
 
 
-class AnthemShowerValve(CoordinatorEntity[AnthemCoordinator], ValveEntity):
-    """Valve entity to start/stop the shower."""
+class AnthemValveBase(CoordinatorEntity[AnthemCoordinator], ValveEntity):
+    """Common behaviour of the hub's valves."""
 
     _attr_has_entity_name = True
-    _attr_name = "Shower"
-    _attr_icon = "mdi:shower-head"
     _attr_supported_features = ValveEntityFeature.OPEN | ValveEntityFeature.CLOSE
     _attr_reports_position = False
 
     def __init__(self, coordinator: AnthemCoordinator, entry: ConfigEntry) -> None:
         """Initialise the valve entity."""
         super().__init__(coordinator)
-        self._attr_unique_id = f"{entry.entry_id}_shower_valve"
         host = entry.data[CONF_HOST]
         self._attr_device_info = DeviceInfo(
             identifiers={(DOMAIN, entry.entry_id)},
@@ -49,22 +52,66 @@ class AnthemShowerValve(CoordinatorEntity[AnthemCoordinator], ValveEntity):
             configuration_url=f"http://{host}",
         )
 
+
+class AnthemShowerValve(AnthemValveBase):
+    """Valve entity to start/stop the shower."""
+
+    _attr_name = "Shower"
+    _attr_icon = "mdi:shower-head"
+
+    def __init__(self, coordinator: AnthemCoordinator, entry: ConfigEntry) -> None:
+        """Initialise the valve entity."""
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{entry.entry_id}_shower_valve"
+
     @property
     def is_closed(self) -> bool:
         """Return True if the shower is not running."""
         if self.coordinator.data is None:
             return True
-        return not self.coordinator.data.get("running", False)
+        return not self.coordinator.data.running
 
     async def async_open_valve(self, **kwargs) -> None:
         """Turn on the shower."""
-        temperature = self.coordinator.target_temperature
-        _LOGGER.debug("Starting shower at %s F", temperature)
-        await self.coordinator.client.start_water_test(temperature)
-        await self.coordinator.async_request_refresh()
+        _LOGGER.debug("Starting shower at %s F", self.coordinator.target_temperature)
+        await self.coordinator.async_start_shower()
 
     async def async_close_valve(self, **kwargs) -> None:
         """Turn off the shower."""
         _LOGGER.debug("Stopping shower")
-        await self.coordinator.client.stop_water_test()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_stop_shower()
+
+
+class AnthemOutletValve(AnthemValveBase):
+    """Valve entity for one outlet of one zone."""
+
+    _attr_icon = "mdi:valve"
+
+    def __init__(
+        self, coordinator: AnthemCoordinator, entry: ConfigEntry, zone: int, outlet: int
+    ) -> None:
+        """Initialise the valve entity."""
+        super().__init__(coordinator, entry)
+        self._zone = zone
+        self._outlet = outlet
+        self._attr_name = f"Zone {zone} Outlet {outlet}"
+        self._attr_unique_id = f"{entry.entry_id}_zone{zone}_outlet{outlet}"
+
+    @property
+    def is_closed(self) -> bool:
+        """Return True unless water is running through this outlet."""
+        data = self.coordinator.data
+        if data is None or not data.running:
+            return True
+        if (reported := data.zone(self._zone)) is not None and len(reported.outlets) >= self._outlet:
+            return not reported.outlets[self._outlet - 1]
+        settings = self.coordinator.zone_settings.get(self._zone)
+        return settings is None or not settings.outlets[self._outlet - 1]
+
+    async def async_open_valve(self, **kwargs) -> None:
+        """Turn on the outlet."""
+        await self.coordinator.async_set_outlet(self._zone, self._outlet, True)
+
+    async def async_close_valve(self, **kwargs) -> None:
+        """Turn off the outlet."""
+        await self.coordinator.async_set_outlet(self._zone, self._outlet, False)
@@ -0,0 +1 @@
+"""Tests for the Anthem Shower integration."""
@@ -0,0 +1,38 @@
+"""Fixtures for Anthem Shower tests."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.anthem_shower.coordinator import AnthemCoordinator
+from custom_components.anthem_shower.models import HubState
+from custom_components.anthem_shower.scheduler import AnthemPollScheduler
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable loading the integration from custom_components."""
+    return
+
+
+@pytest.fixture
+async def coordinator(hass) -> AnthemCoordinator:
+    """Return a coordinator whose hub requests are mocked, showing an idle hub."""
+    coordinator = AnthemCoordinator(
+        hass,
+        MagicMock(),
+        60,
+        min_interval=5,
+        max_interval=300,
+        entry_id="test",
+        scheduler=AnthemPollScheduler(),
+    )
+    coordinator.queue = AsyncMock()
+    coordinator.queue.async_poll.return_value = HubState(running=False)
+    coordinator.queue.async_start_zones.return_value = None
+    coordinator.queue.async_stop_water_test.return_value = None
+    coordinator.async_set_updated_data(HubState(running=False))
+    yield coordinator
+    await coordinator.async_shutdown()
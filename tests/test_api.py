@@ -0,0 +1,63 @@
+"""Tests for the Anthem hub API client."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from bench.fake_hub import FakeHub, FakeHubConfig
+from custom_components.anthem_shower.api import AnthemApiClient, AnthemAuthError, TokenRejected
+
+
+async def test_wrong_pin_costs_one_login_per_call() -> None:
+    """A refused login is not retried as if a token had been rejected."""
+    hub = FakeHub(FakeHubConfig())
+    client = AnthemApiClient(await hub.start(), "0000")
+    hub.attach(client)
+    try:
+        for _ in range(3):
+            with pytest.raises(AnthemAuthError) as err:
+                await client.get_running_state()
+            assert not isinstance(err.value, TokenRejected)
+    finally:
+        await client.async_close()
+        await hub.stop()
+
+    assert hub.requests["request_user_login"] == 3
+    assert hub.requests["get_hub_running_state"] == 0
+
+
+async def test_concurrent_callers_share_one_login() -> None:
+    """Ten polls on an expired token log in once between them."""
+    hub = FakeHub(FakeHubConfig(latency=0.02))
+    client = AnthemApiClient(await hub.start(), "1234")
+    hub.attach(client)
+    try:
+        await client.get_running_state()
+        client._token_exp = time.time()
+        await asyncio.gather(*(client.get_running_state() for _ in range(10)))
+    finally:
+        await client.async_close()
+        await hub.stop()
+
+    assert hub.logins == 2
+    assert hub.requests["get_hub_running_state"] == 11
+
+
+async def test_close_cancels_token_renewal() -> None:
+    """Closing the client stops the background renewal it scheduled."""
+    hub = FakeHub(FakeHubConfig())
+    client = AnthemApiClient(await hub.start(), "1234")
+    hub.attach(client)
+    try:
+        await client.get_running_state()
+        renewal = client._renew_handle
+        assert renewal is not None
+    finally:
+        await client.async_close()
+        await hub.stop()
+
+    assert renewal.cancelled()
+    assert client._renew_handle is None
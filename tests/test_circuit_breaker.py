@@ -0,0 +1,83 @@
+"""Tests for the API client's circuit breaker."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.anthem_shower.circuit_breaker import BreakerState, CircuitBreaker
+
+
+class Unreachable(Exception):
+    """Stand-in for the client's connection error."""
+
+
+@pytest.fixture
+def clock() -> Iterator[MagicMock]:
+    """Patch the breaker's clock, starting at 0 s."""
+    with patch("custom_components.anthem_shower.circuit_breaker.time") as mock_time:
+        mock_time.monotonic.return_value = 0.0
+        yield mock_time.monotonic
+
+
+def _fail(breaker: CircuitBreaker) -> None:
+    assert breaker.allow_request()
+    with pytest.raises(Unreachable), breaker.attempt(Unreachable):
+        raise Unreachable
+
+
+def _succeed(breaker: CircuitBreaker) -> None:
+    assert breaker.allow_request()
+    with breaker.attempt(Unreachable):
+        pass
+
+
+def test_breaker_opens_probes_and_closes(clock: MagicMock) -> None:
+    """Closed -> open after the threshold -> half-open after the timeout -> closed."""
+    breaker = CircuitBreaker("hub", threshold=3, reset_timeout=30)
+    for _ in range(2):
+        _fail(breaker)
+    assert breaker.state is BreakerState.CLOSED
+
+    _fail(breaker)
+    assert breaker.state is BreakerState.OPEN
+    assert not breaker.allow_request()
+    assert breaker.rejected == 1
+
+    clock.return_value = 30.0
+    assert breaker.state is BreakerState.HALF_OPEN
+    _succeed(breaker)
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.failures == 0
+    assert breaker.trips == 1
+
+
+def test_breaker_rejects_requests_while_probing(clock: MagicMock) -> None:
+    """Only one probe goes out; a failed probe opens the breaker again."""
+    breaker = CircuitBreaker("hub", threshold=1, reset_timeout=30)
+    _fail(breaker)
+    clock.return_value = 30.0
+
+    assert breaker.allow_request()
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert not breaker.allow_request()
+    with pytest.raises(Unreachable), breaker.attempt(Unreachable):
+        raise Unreachable
+
+    assert breaker.state is BreakerState.OPEN
+    assert breaker.retry_in == 30
+    assert breaker.trips == 1
+
+
+def test_other_errors_count_as_reachable(clock: MagicMock) -> None:
+    """An error reply closes the breaker, since the hub answered."""
+    breaker = CircuitBreaker("hub", threshold=1, reset_timeout=30)
+    _fail(breaker)
+    clock.return_value = 30.0
+
+    assert breaker.allow_request()
+    with pytest.raises(ValueError), breaker.attempt(Unreachable):
+        raise ValueError
+    assert breaker.state is BreakerState.CLOSED
@@ -0,0 +1,16 @@
+"""Tests for the Anthem Shower coordinator."""
+
+from __future__ import annotations
+
+from custom_components.anthem_shower.coordinator import AnthemCoordinator
+
+
+async def test_group_stop_during_start_confirmation(coordinator: AnthemCoordinator) -> None:
+    """A group stop inside a start's confirm window drops the optimistic start."""
+    assert not await coordinator.async_start_shower()
+    assert coordinator.data.running
+
+    assert not await coordinator.async_stop_shower(confirm=False)
+    await coordinator.async_refresh()
+
+    assert coordinator.data.running is False
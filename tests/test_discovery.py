@@ -0,0 +1,26 @@
+"""Tests for Anthem Shower discovery helpers."""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from custom_components.anthem_shower.api import AnthemConnectionError
+from custom_components.anthem_shower.discovery import AnthemProbeCache
+from custom_components.anthem_shower.models import HubState
+
+
+async def test_probe_cache_keeps_only_answers() -> None:
+    """A failed probe is retried on the next call; an answer is reused."""
+    cache = AnthemProbeCache()
+    with patch(
+        "custom_components.anthem_shower.discovery.AnthemApiClient.get_running_state",
+        side_effect=[AnthemConnectionError("unreachable"), HubState(running=False)],
+    ) as get_running_state:
+        with pytest.raises(AnthemConnectionError):
+            await cache.async_probe(MagicMock(), "192.0.2.10")
+        assert not (await cache.async_probe(MagicMock(), "192.0.2.10")).running
+        assert not (await cache.async_probe(MagicMock(), "192.0.2.10")).running
+
+    assert get_running_state.call_count == 2
@@ -0,0 +1,31 @@
+"""Smoke tests driving the API client against the bench's fake hub."""
+
+from __future__ import annotations
+
+from bench.fake_hub import FakeHub, FakeHubConfig
+from custom_components.anthem_shower.api import AnthemApiClient
+from custom_components.anthem_shower.models import ZoneState
+
+
+async def test_client_against_fake_hub() -> None:
+    """Poll, start and stop, logging in again once the token is rejected."""
+    hub = FakeHub(FakeHubConfig())
+    client = AnthemApiClient(await hub.start(), "1234")
+    hub.attach(client)
+    try:
+        assert not (await client.get_running_state()).running
+        await client.start_zones([ZoneState(1, 40.0, 100, (1, 0))])
+        state = await client.get_running_state()
+        assert state.running
+        assert state.device_names == ("Shower",)
+        assert state.zone(1).outlets == (1, 0)
+
+        hub._tokens.clear()
+        await client.stop_water_test()
+        assert not (await client.get_running_state()).running
+    finally:
+        await client.async_close()
+        await hub.stop()
+
+    assert hub.logins == 2
+    assert hub.requests["req_update_command"] == 3
@@ -0,0 +1,52 @@
+"""Tests for the shower session history."""
+
+from __future__ import annotations
+
+import json
+
+from custom_components.anthem_shower.history import SessionHistory, ShowerSession
+
+
+def _session(start: float, temperature: float | None = 100.0) -> ShowerSession:
+    return ShowerSession(start, start + 300, temperature, ("Shower",))
+
+
+def test_history_overwrites_oldest_when_full() -> None:
+    """Past capacity the oldest sessions go; lifetime totals keep counting."""
+    history = SessionHistory(capacity=3)
+    for start in range(5):
+        history.append(_session(start * 1000.0))
+
+    assert len(history) == 3
+    assert [session.start for session in history] == [2000.0, 3000.0, 4000.0]
+    assert history.last == _session(4000.0)
+    assert history.total_sessions == 5
+    assert history.total_duration == 1500
+    assert history.mean_duration == 300
+    assert history.count_since(3000.0) == 2
+
+
+def test_history_round_trips_through_storage() -> None:
+    """as_dict survives JSON and from_dict restores sessions and totals."""
+    history = SessionHistory(capacity=3)
+    for start in range(4):
+        history.append(_session(start * 1000.0, temperature=None if start == 3 else 100.0))
+
+    restored = SessionHistory.from_dict(json.loads(json.dumps(history.as_dict())), capacity=3)
+
+    assert list(restored) == list(history)
+    assert restored.last.temperature is None
+    assert restored.total_sessions == 4
+    assert restored.total_duration == history.total_duration
+
+
+def test_history_restored_into_smaller_capacity() -> None:
+    """Restoring into a smaller buffer keeps the newest sessions."""
+    history = SessionHistory(capacity=4)
+    for start in range(4):
+        history.append(_session(start * 1000.0))
+
+    restored = SessionHistory.from_dict(history.as_dict(), capacity=2)
+
+    assert [session.start for session in restored] == [2000.0, 3000.0]
+    assert restored.total_sessions == 4
@@ -0,0 +1,38 @@
+"""Tests for setting up Anthem Shower config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from custom_components.anthem_shower.api import AnthemConnectionError
+from custom_components.anthem_shower.const import CONF_HOST, DOMAIN
+
+
+def _queue_workers() -> list[asyncio.Task]:
+    return [
+        task
+        for task in asyncio.all_tasks()
+        if task.get_coro().__qualname__ == "AnthemRequestQueue._run"
+    ]
+
+
+async def test_failed_first_refresh_stops_request_queue(hass: HomeAssistant) -> None:
+    """A hub that can't be reached at setup leaves no queue worker behind."""
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_HOST: "192.0.2.10"})
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.anthem_shower.api.AnthemApiClient.get_running_state",
+        side_effect=AnthemConnectionError("unreachable"),
+    ):
+        assert not await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.SETUP_RETRY
+    assert not _queue_workers()
@@ -0,0 +1,25 @@
+"""Tests for parsing hub replies."""
+
+from __future__ import annotations
+
+import pytest
+
+from custom_components.anthem_shower.models import HubState
+
+
+@pytest.mark.parametrize(
+    ("devicename", "expected"),
+    [(None, ()), ("Shower", ("Shower",)), (["Shower", "Bath"], ("Shower", "Bath"))],
+)
+def test_device_names(devicename: object, expected: tuple[str, ...]) -> None:
+    """Missing, null and single device names parse without error."""
+    state = HubState.from_response({"running": True, "devicename": devicename})
+    assert state.device_names == expected
+
+
+def test_bad_outlet_states_read_as_off() -> None:
+    """Outlet entries that aren't numbers keep their position but read as off."""
+    state = HubState.from_response(
+        {"running": True, "zone1": {"outletState": [1, "on", None, "1"]}}
+    )
+    assert state.zone(1).outlets == (1, 0, 0, 1)
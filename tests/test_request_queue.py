@@ -0,0 +1,127 @@
+"""Tests for the per-hub request queue."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from bench.fake_hub import FakeHub, FakeHubConfig
+from custom_components.anthem_shower.api import AnthemApiClient
+from custom_components.anthem_shower.models import HubState, ZoneState
+from custom_components.anthem_shower.request_queue import (
+    AnthemRequestQueue,
+    CommandSupersededError,
+    StalePollError,
+)
+from custom_components.anthem_shower.scheduler import AnthemPollScheduler
+
+ZONES = (ZoneState(1, 40.0, 100, (1, 0)),)
+
+
+class GatedClient:
+    """Client stand-in whose polls wait until the test opens the gate."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.running = False
+        self.gate = asyncio.Event()
+
+    async def get_running_state(self) -> HubState:
+        self.calls.append("poll")
+        await self.gate.wait()
+        return HubState(running=self.running)
+
+    async def start_zones(self, zones: tuple[ZoneState, ...]) -> None:
+        self.calls.append("start")
+        self.running = True
+
+    async def stop_water_test(self) -> None:
+        self.calls.append("stop")
+        self.running = False
+
+    async def poll_sent(self) -> None:
+        while "poll" not in self.calls:
+            await asyncio.sleep(0)
+
+
+async def test_latest_command_wins() -> None:
+    """A stop queued after a waiting start drops the start, and the in-flight poll."""
+    client = GatedClient()
+    queue = AnthemRequestQueue(client)
+    poll = asyncio.create_task(queue.async_poll())
+    await client.poll_sent()
+    start = asyncio.create_task(queue.async_start_zones(ZONES))
+    stop = asyncio.create_task(queue.async_stop_water_test())
+    await asyncio.sleep(0)
+    client.gate.set()
+
+    with pytest.raises(StalePollError):
+        await poll
+    with pytest.raises(CommandSupersededError):
+        await start
+    await stop
+    assert client.calls == ["poll", "stop"]
+    assert not client.running
+    await queue.async_close()
+
+
+async def test_commands_go_ahead_of_waiting_polls() -> None:
+    """Waiting polls merge into one, sent after the command queued behind them."""
+    client = GatedClient()
+    queue = AnthemRequestQueue(client)
+    first = asyncio.create_task(queue.async_poll())
+    await client.poll_sent()
+    waiting = [asyncio.create_task(queue.async_poll()) for _ in range(3)]
+    start = asyncio.create_task(queue.async_start_zones(ZONES))
+    await asyncio.sleep(0)
+    client.gate.set()
+
+    await start
+    states = await asyncio.gather(*waiting)
+    assert client.calls == ["poll", "start", "poll"]
+    assert all(state.running for state in states)
+    with pytest.raises(StalePollError):
+        await first
+    await queue.async_close()
+
+
+async def test_poll_waiting_for_a_slot_does_not_hold_up_commands() -> None:
+    """Commands go out while the hub's poll waits for a domain-wide slot."""
+    client = GatedClient()
+    client.gate.set()
+    scheduler = AnthemPollScheduler(max_concurrent=1)
+    queue = AnthemRequestQueue(client, scheduler.poll_slot)
+    async with scheduler.poll_slot():
+        poll = asyncio.create_task(queue.async_poll())
+        await asyncio.wait_for(queue.async_stop_water_test(), 1)
+        assert client.calls == ["stop"]
+    assert not (await poll).running
+    assert client.calls == ["stop", "poll"]
+    await queue.async_close()
+
+
+async def test_latest_command_wins_against_fake_hub() -> None:
+    """With a poll in flight, start then stop leaves the hub stopped."""
+    hub = FakeHub(FakeHubConfig(latency=0.05))
+    client = AnthemApiClient(await hub.start(), "1234")
+    hub.attach(client)
+    queue = AnthemRequestQueue(client)
+    try:
+        await queue.async_poll()
+        poll = asyncio.create_task(queue.async_poll())
+        await asyncio.sleep(0.01)
+        results = await asyncio.gather(
+            poll,
+            queue.async_start_zones(ZONES),
+            queue.async_stop_water_test(),
+            return_exceptions=True,
+        )
+        assert isinstance(results[0], StalePollError)
+        assert isinstance(results[1], CommandSupersededError)
+        assert not hub.running
+        assert not (await queue.async_poll()).running
+    finally:
+        await queue.async_close()
+        await client.async_close()
+        await hub.stop()
@@ -0,0 +1,51 @@
+"""Tests for latency-aware request timeouts."""
+
+from __future__ import annotations
+
+from custom_components.anthem_shower.metrics import EndpointMetrics
+from custom_components.anthem_shower.timeouts import TimeoutBudget
+
+BUDGET = TimeoutBudget(minimum=1.0, maximum=10.0, factor=4.0)
+
+
+def _metrics(round_trip: float, samples: int = 5) -> EndpointMetrics:
+    metrics = EndpointMetrics()
+    for _ in range(samples):
+        metrics.record(round_trip, "success")
+    return metrics
+
+
+def test_maximum_until_enough_samples() -> None:
+    """Fewer than five round trips get the maximum for the whole request."""
+    timeout = BUDGET.timeout(_metrics(0.5, samples=4))
+    assert timeout.total == 10.0
+    assert timeout.sock_connect is None
+    assert timeout.sock_read is None
+
+
+def test_timeouts_follow_round_trips() -> None:
+    """Connect and read timeouts are the round trip times the factor."""
+    timeout = BUDGET.timeout(_metrics(0.5))
+    assert (timeout.sock_connect, timeout.sock_read, timeout.total) == (2.0, 2.0, 4.0)
+
+
+def test_timeouts_are_clamped() -> None:
+    """Very fast or very slow hubs stay within the budget's limits."""
+    fast = BUDGET.timeout(_metrics(0.1))
+    assert (fast.sock_connect, fast.sock_read, fast.total) == (1.0, 1.0, 2.0)
+    slow = BUDGET.timeout(_metrics(5.0))
+    assert (slow.sock_connect, slow.sock_read, slow.total) == (10.0, 10.0, 10.0)
+
+
+def test_consecutive_timeouts_double_the_timeout() -> None:
+    """Each timeout in a row doubles the timeouts, up to the maximum."""
+    metrics = _metrics(0.5)
+    metrics.record(4.0, "timeout")
+    assert BUDGET.timeout(metrics).sock_read == 4.0
+    metrics.record(4.0, "timeout")
+    assert BUDGET.timeout(metrics).sock_read == 8.0
+    metrics.record(8.0, "timeout")
+    assert BUDGET.timeout(metrics).sock_read == 10.0
+
+    metrics.record(0.5, "success")
+    assert BUDGET.timeout(metrics).sock_read == 2.0